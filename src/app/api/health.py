@@ -2,20 +2,28 @@
 from datetime import datetime, timedelta
 from typing import Dict, Any
 from fastapi import APIRouter, Depends
-from sqlalchemy import func, text
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from app.core.database import get_db, engine
+from app.core.database import get_db, ping_db
 from app.core.config import settings
+from app.core.cache import cached_response
+from app.core.logging import get_logger
+from app.core.redis import count_live_workers, count_recent_alerts, get_redis
 from app.schemas.schemas import HealthResponse, StatsResponse
 from app.models.models import Alert, APICall
-from app.tasks.celery_app import celery_app
+from app.tasks.tasks import celery_app
 import redis
 
+logger = get_logger(__name__)
 router = APIRouter()
 
+# Shared Celery inspector, created once and reused by every request
+_inspector = celery_app.control.inspect(timeout=0.5)
+
 
 @router.get("/health", response_model=HealthResponse)
-def health_check(db: Session = Depends(get_db)) -> HealthResponse:
+@cached_response("health", ttl=settings.cache_health_ttl)
+def health_check() -> HealthResponse:
     """
     Health check endpoint.
     
@@ -27,25 +35,23 @@ def health_check(db: Session = Depends(get_db)) -> HealthResponse:
     
     # Check database
     try:
-        db.execute(text("SELECT 1"))
+        ping_db()
         db_status = "healthy"
     except Exception as e:
         db_status = f"unhealthy: {str(e)}"
     
     # Check Redis
     try:
-        r = redis.from_url(settings.redis_url)
-        r.ping()
+        get_redis().ping()
         redis_status = "healthy"
     except Exception as e:
         redis_status = f"unhealthy: {str(e)}"
     
-    # Check Celery workers
+    # Check Celery workers via their heartbeats (no broker RPC)
     try:
-        inspector = celery_app.control.inspect()
-        active_workers = inspector.active()
-        if active_workers:
-            celery_status = f"healthy ({len(active_workers)} workers)"
+        live_workers = count_live_workers()
+        if live_workers:
+            celery_status = f"healthy ({live_workers} workers)"
         else:
             celery_status = "no workers available"
     except Exception as e:
@@ -69,16 +75,15 @@ def health_check(db: Session = Depends(get_db)) -> HealthResponse:
 
 
 @router.get("/health/ready")
-def readiness_check(db: Session = Depends(get_db)) -> Dict[str, Any]:
+def readiness_check() -> Dict[str, Any]:
     """Readiness check for Kubernetes."""
     
     try:
         # Check if database is ready
-        db.execute(text("SELECT 1"))
+        ping_db()
         
         # Check if Redis is ready
-        r = redis.from_url(settings.redis_url)
-        r.ping()
+        get_redis().ping()
         
         return {"status": "ready"}
     except Exception as e:
@@ -92,58 +97,53 @@ def liveness_check() -> Dict[str, Any]:
 
 
 @router.get("/stats", response_model=StatsResponse)
+@cached_response("stats", ttl=settings.cache_stats_ttl)
 def get_statistics(db: Session = Depends(get_db)) -> StatsResponse:
     """Get system statistics."""
     
-    # Total counts
-    total_api_calls = db.query(func.count(APICall.id)).scalar()
-    total_alerts = db.query(func.count(Alert.id)).scalar()
-    
-    # Alerts by status
-    alerts_by_status = dict(
-        db.query(Alert.status, func.count(Alert.id))
-        .group_by(Alert.status)
-        .all()
-    )
+    total_api_calls = db.scalar(select(func.count()).select_from(APICall))
     
-    # Alerts by processing status
-    alerts_by_processing_status = dict(
-        db.query(Alert.processing_status, func.count(Alert.id))
-        .group_by(Alert.processing_status)
-        .all()
-    )
+    # Alert totals and per-status breakdown in a single grouped pass instead
+    # of one round-trip per figure
+    alerts_by_status: Dict[str, int] = dict(db.execute(
+        select(Alert.status, func.count()).group_by(Alert.status)
+    ).all())
+    total_alerts = sum(alerts_by_status.values())
     
-    # Recent alerts (last 24 hours)
-    cutoff = datetime.utcnow() - timedelta(hours=24)
-    recent_alerts = db.query(func.count(Alert.id)).filter(
-        Alert.created_at >= cutoff
-    ).scalar()
+    # Recent alerts (last 24 hours) from the Redis rolling counter, falling
+    # back to a range count if Redis is unavailable
+    try:
+        recent_alerts = count_recent_alerts()
+    except redis.RedisError as e:
+        logger.warning(f"Recent alert counter unavailable, counting in database: {e}")
+        cutoff = datetime.utcnow() - timedelta(hours=24)
+        recent_alerts = db.scalar(
+            select(func.count()).select_from(Alert).where(Alert.created_at >= cutoff)
+        )
     
     return StatsResponse(
         total_api_calls=total_api_calls or 0,
-        total_alerts=total_alerts or 0,
+        total_alerts=total_alerts,
         alerts_by_status=alerts_by_status,
-        alerts_by_processing_status=alerts_by_processing_status,
-        recent_alerts=recent_alerts or 0
+        recent_alerts=recent_alerts
     )
 
 
 @router.get("/stats/celery")
+@cached_response("celery_stats", ttl=settings.cache_celery_stats_ttl)
 def get_celery_stats() -> Dict[str, Any]:
     """Get Celery worker statistics."""
     
     try:
-        inspector = celery_app.control.inspect()
-        
         # Get active tasks
-        active = inspector.active()
+        active = _inspector.active()
         active_count = sum(len(tasks) for tasks in active.values()) if active else 0
         
         # Get registered tasks
-        registered = inspector.registered()
+        registered = _inspector.registered()
         
         # Get worker stats
-        stats = inspector.stats()
+        stats = _inspector.stats()
         
         return {
             "status": "available",
@@ -0,0 +1,89 @@
+"""Alert storage shared by the webhook endpoints."""
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert
+from app.models.models import Alert
+from app.models.types import current_timestamp_ms
+
+# Rows per upsert statement for very large webhook bursts
+ALERT_UPSERT_CHUNK_SIZE = 10000
+
+
+def upsert_alerts(db: Session, rows: List[Dict[str, Any]]) -> Tuple[List[int], Dict[str, datetime]]:
+    """Insert new alerts and update re-sent ones, matched on the unique fingerprint.
+
+    Runs in the caller's transaction: one upsert statement per
+    ALERT_UPSERT_CHUNK_SIZE rows, plus a lookup before and after.
+
+    Alertmanager re-sends firing alerts every repeat_interval and sends
+    resolved notifications, neither of which should start another
+    remediation. Only new alerts and known alerts that have started firing
+    again are returned for dispatch.
+
+    Args:
+        db: Database session
+        rows: Alert column values, one dict per alert
+
+    Returns:
+        (ids of the alerts to dispatch, {fingerprint: created_at} of every stored alert)
+    """
+    if not rows:
+        return [], {}
+
+    fingerprints = [row["fingerprint"] for row in rows]
+
+    previous_status = dict(db.execute(
+        select(Alert.fingerprint, Alert.status).where(Alert.fingerprint.in_(fingerprints))
+    ).all())
+
+    dialect_name = db.get_bind().dialect.name
+    for start in range(0, len(rows), ALERT_UPSERT_CHUNK_SIZE):
+        db.execute(_upsert_statement(dialect_name, rows[start:start + ALERT_UPSERT_CHUNK_SIZE]))
+
+    # Fetch the ids and creation times of new and updated alerts in one
+    # round-trip (RETURNING isn't available on every MySQL/MariaDB version)
+    stored = db.execute(
+        select(Alert.id, Alert.fingerprint, Alert.status, Alert.created_at).where(
+            Alert.fingerprint.in_(fingerprints)
+        ).order_by(Alert.id)
+    ).all()
+
+    alert_ids = [
+        row.id for row in stored
+        if row.fingerprint not in previous_status
+        or (row.status == "firing" and previous_status[row.fingerprint] != "firing")
+    ]
+    created = {row.fingerprint: row.created_at for row in stored}
+
+    return alert_ids, created
+
+
+def _upsert_statement(dialect_name: str, rows: List[Dict[str, Any]]) -> Insert:
+    """Build the alert upsert for a dialect.
+
+    MySQL/MariaDB use INSERT ... ON DUPLICATE KEY UPDATE; other backends
+    (SQLite in the test suite) use the equivalent ON CONFLICT form.
+    """
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = mysql_insert(Alert).values(rows)
+        return stmt.on_duplicate_key_update(**_resent_alert_updates(stmt.inserted))
+
+    stmt = sqlite_insert(Alert).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[Alert.fingerprint],
+        set_=_resent_alert_updates(stmt.excluded)
+    )
+
+
+def _resent_alert_updates(new: Any) -> Dict[str, Any]:
+    """Columns refreshed when Alertmanager re-sends a known alert."""
+    return {
+        "status": new.status,
+        "ends_at": new.ends_at,
+        "raw_data": new.raw_data,
+        "updated_at": current_timestamp_ms(),
+    }
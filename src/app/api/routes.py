@@ -1,29 +1,32 @@
 """API routes for webhook and alert management."""
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import and_, func, desc, or_, select
 from celery.result import AsyncResult
+from app.api.ingest import upsert_alerts
 from app.core.database import get_db
 from app.core.middleware import get_request_id, get_api_call_id
 from app.core.logging import get_logger
-from app.models.models import Alert, APICall, TaskExecution
+from app.core.redis import record_alerts_created
+from app.models.models import Alert, TaskExecution
 from app.schemas.schemas import (
     AlertmanagerWebhook,
     WebhookResponse,
     AlertResponse,
     TaskStatusResponse,
 )
-from app.tasks.celery_app import celery_app
-from app.tasks.alert_tasks import process_alert_batch
+from app.tasks.tasks import celery_app, process_alert, process_alert_batch
+import redis
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
 @router.post("/webhook", response_model=WebhookResponse, status_code=202)
-async def receive_alertmanager_webhook(
+def receive_alertmanager_webhook(
     webhook: AlertmanagerWebhook,
     request: Request,
     db: Session = Depends(get_db)
@@ -54,78 +57,77 @@ async def receive_alertmanager_webhook(
             message="No alerts in webhook payload"
         )
     
-    alert_fingerprints = []
+    alert_rows = []
     
-    # Store alerts in database
+    # Build one row per alert; the batch is stored by upsert_alerts
     for alert_data in webhook.alerts:
         try:
-            # Check if alert already exists
-            existing_alert = db.query(Alert).filter(
-                Alert.fingerprint == alert_data.fingerprint
-            ).first()
-            
-            if existing_alert:
-                # Update existing alert
-                existing_alert.status = alert_data.status
-                existing_alert.ends_at = alert_data.endsAt
-                existing_alert.updated_at = datetime.utcnow()
-                existing_alert.raw_data = alert_data.model_dump(mode='json')
-                logger.info(f"Updated existing alert: {alert_data.fingerprint}")
-            else:
-                # Create new alert
-                alert = Alert(
-                    api_call_id=api_call_id,
-                    fingerprint=alert_data.fingerprint,
-                    status=alert_data.status,
-                    alert_name=alert_data.labels.alertname,
-                    severity=alert_data.labels.severity,
-                    instance=alert_data.labels.instance,
-                    labels=alert_data.labels.model_dump(mode='json'),
-                    annotations=alert_data.annotations.model_dump(mode='json') if alert_data.annotations else None,
-                    starts_at=alert_data.startsAt,
-                    ends_at=alert_data.endsAt,
-                    generator_url=alert_data.generatorURL,
-                    raw_data=alert_data.model_dump(mode='json'),
-                    processing_status="pending"
-                )
-                db.add(alert)
-                logger.info(f"Created new alert: {alert_data.fingerprint}")
-            
-            alert_fingerprints.append(alert_data.fingerprint)
+            alert_rows.append({
+                "api_call_id": api_call_id,
+                "fingerprint": alert_data.fingerprint,
+                "status": alert_data.status,
+                "alert_name": alert_data.labels.alertname,
+                "severity": alert_data.labels.severity,
+                "instance": alert_data.labels.instance,
+                "labels": alert_data.labels.model_dump(mode='json'),
+                "annotations": alert_data.annotations.model_dump(mode='json') if alert_data.annotations else None,
+                "starts_at": alert_data.startsAt,
+                "ends_at": alert_data.endsAt,
+                "raw_data": alert_data.model_dump(mode='json'),
+            })
             
         except Exception as e:
             logger.error(f"Error storing alert {alert_data.fingerprint}: {e}", exc_info=True)
             # Continue processing other alerts
             continue
     
-    # Commit all alerts
+    # Insert new alerts and update existing ones; only new and re-firing
+    # alerts are dispatched
+    alert_ids, created = upsert_alerts(db, alert_rows)
+    logger.info(f"Stored {len(alert_rows)} alerts", extra={"request_id": request_id})
+    
+    # Record the batch task execution in the same transaction as the alerts.
+    # The task id is assigned up front so the record can be written before the
+    # task is queued, and queuing after the commit guarantees the worker can
+    # see the rows it is given.
+    task_id = str(uuid.uuid4())
+    task_execution = None
+    if alert_ids:
+        task_execution = TaskExecution(
+            task_id=task_id,
+            task_name="process_alert_batch",
+            status="pending",
+            args=[alert_ids, request_id],
+            kwargs={}
+        )
+        db.add(task_execution)
+    
+    # Commit all alerts and the task execution record
     db.commit()
     
+    # Feed the rolling recent-alerts counter used by /stats
+    try:
+        record_alerts_created(created)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to update recent alert counter: {e}")
+    
     # Queue alerts for processing
     task_ids = []
-    if alert_fingerprints:
+    if task_execution:
         try:
-            result = process_alert_batch.delay(alert_fingerprints)
-            task_ids.append(result.id)
-            
-            # Record batch task execution
-            task_execution = TaskExecution(
-                task_id=result.id,
-                task_name="process_alert_batch",
-                status="pending",
-                args=[],
-                kwargs={"alert_fingerprints": alert_fingerprints}
-            )
-            db.add(task_execution)
-            db.commit()
+            process_alert_batch.apply_async(args=[alert_ids, request_id], task_id=task_id)
+            task_ids.append(task_id)
             
             logger.info(
-                f"Queued {len(alert_fingerprints)} alerts for processing",
-                extra={"request_id": request_id, "task_id": result.id}
+                f"Queued {len(alert_ids)} alerts for processing",
+                extra={"request_id": request_id, "task_id": task_id}
             )
             
         except Exception as e:
             logger.error(f"Error queuing alerts for processing: {e}", exc_info=True)
+            task_execution.status = "failed"
+            task_execution.error = str(e)
+            db.commit()
             raise HTTPException(status_code=500, detail="Failed to queue alerts for processing")
     
     return WebhookResponse(
@@ -139,30 +141,67 @@ async def receive_alertmanager_webhook(
 
 @router.get("/alerts", response_model=List[AlertResponse])
 def list_alerts(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by alert status (firing/resolved)"),
-    processing_status: Optional[str] = Query(None, description="Filter by processing status"),
     alert_name: Optional[str] = Query(None, description="Filter by alert name"),
     severity: Optional[str] = Query(None, description="Filter by severity"),
     limit: int = Query(100, le=1000, description="Maximum number of alerts to return"),
     offset: int = Query(0, ge=0, description="Number of alerts to skip"),
+    before_created_at: Optional[datetime] = Query(
+        None, description="Keyset cursor: created_at of the last alert on the previous page"
+    ),
+    before_id: Optional[int] = Query(
+        None, description="Keyset cursor: id of the last alert on the previous page"
+    ),
+    include_total: bool = Query(
+        False, description="Return the number of matching alerts in the X-Total-Count header"
+    ),
     db: Session = Depends(get_db)
 ) -> List[AlertResponse]:
-    """List alerts with optional filtering."""
+    """
+    List alerts with optional filtering.
+    
+    With ``include_total=true`` the number of alerts matching the filters is
+    returned in the ``X-Total-Count`` header. It is opt-in because an
+    unfiltered count scans the whole table.
     
-    query = db.query(Alert)
+    For deep pagination pass ``before_created_at`` and ``before_id`` from the
+    last alert of the previous page instead of a large ``offset``; the cursor
+    seeks directly into the created_at indexes rather than scanning skipped rows.
+    """
+    
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=422,
+            detail="before_created_at and before_id must be passed together"
+        )
     
     # Apply filters
+    filters = []
     if status:
-        query = query.filter(Alert.status == status)
-    if processing_status:
-        query = query.filter(Alert.processing_status == processing_status)
+        filters.append(Alert.status == status)
     if alert_name:
-        query = query.filter(Alert.alert_name == alert_name)
+        filters.append(Alert.alert_name == alert_name)
     if severity:
-        query = query.filter(Alert.severity == severity)
+        filters.append(Alert.severity == severity)
     
-    # Order by created_at descending
-    query = query.order_by(desc(Alert.created_at))
+    if include_total:
+        # Count separately from the page query so each can use its own index
+        total = db.scalar(select(func.count()).select_from(Alert).where(*filters))
+        response.headers["X-Total-Count"] = str(total)
+    
+    query = db.query(Alert).filter(*filters)
+    
+    if before_created_at is not None:
+        # Expanded form of (created_at, id) < cursor; MySQL only uses the index
+        # range for row-value comparisons on recent versions
+        query = query.filter(or_(
+            Alert.created_at < before_created_at,
+            and_(Alert.created_at == before_created_at, Alert.id < before_id)
+        ))
+    
+    # Order by created_at descending (id breaks ties for stable keyset paging)
+    query = query.order_by(desc(Alert.created_at), desc(Alert.id))
     
     # Apply pagination
     alerts = query.offset(offset).limit(limit).all()
@@ -183,62 +222,54 @@ def get_alert(fingerprint: str, db: Session = Depends(get_db)) -> AlertResponse:
 
 
 @router.post("/alerts/{fingerprint}/retry")
-async def retry_alert(
+def retry_alert(
     fingerprint: str,
     request: Request,
     db: Session = Depends(get_db)
 ) -> WebhookResponse:
-    """Retry processing for a specific alert."""
+    """Retry processing for a specific alert.
+    
+    Triggers the alert's StackStorm workflow again; the new execution is linked
+    to this request's request_id.
+    """
     
     request_id = get_request_id(request)
     
-    alert = db.query(Alert).filter(Alert.fingerprint == fingerprint).first()
+    alert_id = db.scalar(select(Alert.id).where(Alert.fingerprint == fingerprint))
     
-    if not alert:
+    if alert_id is None:
         raise HTTPException(status_code=404, detail="Alert not found")
     
-    if alert.processing_status not in ["failed", "completed"]:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Cannot retry alert in {alert.processing_status} status"
-        )
-    
-    # Reset processing status
-    alert.processing_status = "pending"
-    alert.error_message = None
-    db.commit()
-    
-    # Queue for processing
-    from app.tasks.alert_tasks import process_alert
-    
-    alert_data = {
-        "fingerprint": alert.fingerprint,
-        "status": alert.status,
-        "labels": alert.labels,
-        "annotations": alert.annotations,
-    }
-    
-    result = process_alert.delay(alert_data, fingerprint)
-    
-    # Record task execution
+    # Record the task execution before queuing, so the worker never runs a task
+    # with no record
+    task_id = str(uuid.uuid4())
     task_execution = TaskExecution(
-        task_id=result.id,
+        task_id=task_id,
         task_name="process_alert",
         alert_fingerprint=fingerprint,
         status="pending",
-        args=[],
-        kwargs={"alert_data": alert_data, "alert_fingerprint": fingerprint}
+        args=[alert_id, request_id],
+        kwargs={}
     )
     db.add(task_execution)
     db.commit()
     
+    try:
+        process_alert.apply_async(args=[alert_id, request_id], task_id=task_id)
+    except Exception as e:
+        logger.error(f"Error queuing alert for retry: {e}", exc_info=True)
+        task_execution.status = "failed"
+        task_execution.error = str(e)
+        db.commit()
+        raise HTTPException(status_code=500, detail="Failed to queue alert for retry")
+    
     logger.info(f"Queued alert for retry: {fingerprint}", extra={"request_id": request_id})
     
     return WebhookResponse(
         status="queued",
         request_id=request_id,
         alerts_received=1,
-        task_ids=[result.id],
+        task_ids=[task_id],
         message=f"Alert {fingerprint} queued for retry"
     )
 
@@ -247,12 +278,13 @@ async def retry_alert(
 def get_task_status(task_id: str, db: Session = Depends(get_db)) -> TaskStatusResponse:
     """Get the status of a Celery task."""
     
-    # Try to get from database first
+    # The database record only covers queuing: report it if queuing failed,
+    # otherwise ask the result backend
     task_execution = db.query(TaskExecution).filter(
         TaskExecution.task_id == task_id
     ).first()
     
-    if task_execution:
+    if task_execution and task_execution.status == "failed":
         return TaskStatusResponse(
             task_id=task_id,
             status=task_execution.status,
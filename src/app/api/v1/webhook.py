@@ -1,19 +1,39 @@
 """Simplified webhook endpoint - Uses Celery for async ST2 triggering."""
 from fastapi import APIRouter, Depends, Request, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from sqlalchemy import select, true
+from sqlalchemy.orm import Session, joinedload, load_only, raiseload, selectinload
+from typing import Dict, Any, List, Optional, Tuple
 import uuid
 from datetime import datetime
+import orjson
+import redis
 
-from app.core.database import get_db
-from app.models.models_simple import APICall, Alert, ST2ExecutionLink
-from app.tasks.tasks_simple import process_alert
+from app.api.ingest import upsert_alerts
+from app.core.database import get_db, ping_db
+from app.core.logging import get_logger
+from app.core.middleware import cap_logged_body, get_json_body, get_logged_headers, get_stored_body
+from app.core.redis import record_alerts_created
+from app.models.models import APICall, Alert, ST2ExecutionLink
+from app.schemas.schemas import (
+    ActiveAlert,
+    ActiveAlertsResponse,
+    AlertmanagerWebhook,
+    RecentExecution,
+    RecentExecutionAlert,
+    RecentExecutionsResponse,
+    ST2Execution,
+    ST2ExecutionAlert,
+    ST2ExecutionsResponse,
+)
+from app.tasks.tasks import process_alert_batch
 
+logger = get_logger(__name__)
 router = APIRouter()
 
 
 @router.post("/webhook", status_code=status.HTTP_202_ACCEPTED)
-async def receive_webhook(
+def receive_webhook(
+    webhook: AlertmanagerWebhook,
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -22,7 +42,9 @@ async def receive_webhook(
     Flow:
     1. Generate request_id
     2. Store API call + alerts in database
-    3. Queue Celery task to trigger StackStorm
+    3. Queue one Celery task to trigger StackStorm for new alerts and alerts
+       that started firing again (repeats and resolved notifications of
+       known alerts are stored but not re-triggered)
     4. Return 202 Accepted immediately
     
     The Celery task will:
@@ -36,9 +58,13 @@ async def receive_webhook(
     # Generate unique request_id for tracking
     request_id = str(uuid.uuid4())
     
-    # Get request data
-    body = await request.json()
-    headers = dict(request.headers)
+    # Store the payload as received (parsed once by RequestIDMiddleware)
+    body = get_json_body(request)
+    stored_body = get_stored_body(request)
+    if body is None:
+        body = webhook.model_dump(mode='json')
+        stored_body = cap_logged_body(body, len(orjson.dumps(body)))
+    headers = get_logged_headers(request)
     
     # Store API call
     api_call = APICall(
@@ -46,57 +72,118 @@ async def receive_webhook(
         method=request.method,
         path=str(request.url.path),
         headers=headers,
-        body=body,
+        body=stored_body,
         client_host=request.client.host if request.client else None,
         status_code=202  # Accepted
     )
     db.add(api_call)
     db.flush()
     
-    # Process alerts from Alertmanager payload
-    alerts_data = body.get("alerts", [])
-    alert_ids = []
+    # Build one row per alert from the validated Alertmanager payload. The JSON
+    # columns reuse the alert dicts already parsed from the body rather than
+    # dumping another copy of every alert from the model.
+    alert_rows = [
+        {
+            "api_call_id": api_call.id,
+            "fingerprint": alert_data.fingerprint,
+            "status": alert_data.status,
+            "alert_name": alert_data.labels.alertname,
+            "severity": alert_data.labels.severity,
+            "instance": alert_data.labels.instance,
+            "labels": raw_alert["labels"],
+            "annotations": raw_alert.get("annotations"),
+            "raw_data": raw_alert,
+            "starts_at": alert_data.startsAt,
+            "ends_at": alert_data.endsAt,
+        }
+        for alert_data, raw_alert in zip(webhook.alerts, body["alerts"])
+    ]
     
-    for alert_data in alerts_data:
-        labels = alert_data.get("labels", {})
-        annotations = alert_data.get("annotations", {})
-        
-        # Create alert record
-        alert = Alert(
-            api_call_id=api_call.id,
-            fingerprint=alert_data.get("fingerprint", ""),
-            status=alert_data.get("status", ""),
-            alert_name=labels.get("alertname", "Unknown"),
-            severity=labels.get("severity", ""),
-            instance=labels.get("instance", ""),
-            labels=labels,
-            annotations=annotations,
-            raw_data=alert_data,
-            starts_at=alert_data.get("startsAt"),
-            ends_at=alert_data.get("endsAt")
-        )
-        db.add(alert)
-        db.flush()
-        
-        alert_ids.append(alert.id)
-        
-        # Queue Celery task to process this alert
-        process_alert.delay(alert_id=alert.id, request_id=request_id)
+    # Store the alerts; only new and re-firing ones are dispatched
+    alert_ids, created = upsert_alerts(db, alert_rows)
     
     # Mark API call as completed
     api_call.completed_at = datetime.utcnow()
     db.commit()
     
+    # Feed the rolling recent-alerts counter used by /stats
+    try:
+        record_alerts_created(created)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to update recent alert counter: {e}")
+    
+    # Queue one Celery task for the whole batch (the worker fans out per alert)
+    if alert_ids:
+        process_alert_batch.delay(alert_ids=alert_ids, request_id=request_id)
+    
     return {
         "status": "accepted",
         "request_id": request_id,
-        "alerts_received": len(alerts_data),
-        "message": f"Received {len(alerts_data)} alert(s), queued for processing"
+        "alerts_received": len(webhook.alerts),
+        "message": f"Received {len(webhook.alerts)} alert(s), queued for processing"
     }
 
 
+def fetch_audit_tree(
+    db: Session,
+    request_id: str
+) -> Optional[Tuple[APICall, List[Alert], List[ST2ExecutionLink]]]:
+    """Load the API call, alerts and ST2 execution links for a request_id.
+    
+    Three indexed lookups, no joins: the API call by its unique request_id,
+    its alerts by api_call_id, and the links by request_id (idx_st2_link_covering).
+    Only the columns the audit trail reports are loaded, so the compressed
+    request body and alert payloads are never fetched or decompressed.
+    
+    Returns:
+        (api_call, alerts, links), or None if the request_id is unknown
+    """
+    api_call = db.scalars(
+        select(APICall).where(
+            APICall.request_id == request_id
+        ).options(
+            load_only(
+                APICall.id,
+                APICall.request_id,
+                APICall.created_at,
+                APICall.completed_at,
+                APICall.processing_time_ms
+            ),
+            raiseload("*")
+        )
+    ).first()
+    
+    if api_call is None:
+        return None
+    
+    alerts = db.scalars(
+        select(Alert).where(
+            Alert.api_call_id == api_call.id
+        ).options(
+            load_only(
+                Alert.id,
+                Alert.fingerprint,
+                Alert.alert_name,
+                Alert.severity,
+                Alert.instance,
+                Alert.status,
+                Alert.st2_rule_matched
+            ),
+            raiseload("*")
+        )
+    ).all()
+    
+    links = db.scalars(
+        select(ST2ExecutionLink).where(
+            ST2ExecutionLink.request_id == request_id
+        ).options(raiseload("*"))
+    ).all()
+    
+    return api_call, alerts, links
+
+
 @router.get("/status/{request_id}")
-async def get_request_status(
+def get_request_status(
     request_id: str,
     db: Session = Depends(get_db)
 ):
@@ -113,26 +200,15 @@ async def get_request_status(
     Returns:
         dict: Complete status including ST2 execution IDs
     """
-    # Get API call
-    api_call = db.query(APICall).filter(
-        APICall.request_id == request_id
-    ).first()
+    audit_tree = fetch_audit_tree(db, request_id)
     
-    if not api_call:
+    if audit_tree is None:
         raise HTTPException(
             status_code=404,
             detail=f"Request {request_id} not found"
         )
     
-    # Get alerts
-    alerts = db.query(Alert).filter(
-        Alert.api_call_id == api_call.id
-    ).all()
-    
-    # Get ST2 execution links
-    links = db.query(ST2ExecutionLink).filter(
-        ST2ExecutionLink.request_id == request_id
-    ).all()
+    api_call, alerts, links = audit_tree
     
     return {
         "request_id": request_id,
@@ -163,87 +239,102 @@ async def get_request_status(
     }
 
 
-@router.get("/executions/recent")
-async def list_recent_executions(
+@router.get("/executions/recent", response_model=RecentExecutionsResponse)
+def list_recent_executions(
     limit: int = 20,
     db: Session = Depends(get_db)
-):
+) -> RecentExecutionsResponse:
     """List recent webhook requests and their ST2 executions.
     
     Args:
         limit: Maximum number of results to return
     
     Returns:
-        dict: List of recent executions with summary info
+        RecentExecutionsResponse: Recent executions with summary info
     """
-    api_calls = db.query(APICall).order_by(
+    # Load alerts and ST2 links for the whole page in two IN queries, skipping
+    # the compressed request body and alert payloads the summary never reads
+    api_calls = db.query(APICall).options(
+        load_only(APICall.id, APICall.request_id, APICall.created_at),
+        selectinload(APICall.alerts).load_only(
+            Alert.alert_name,
+            Alert.severity,
+            Alert.st2_rule_matched
+        ),
+        selectinload(APICall.st2_links).load_only(ST2ExecutionLink.request_id)
+    ).order_by(
         APICall.created_at.desc()
     ).limit(limit).all()
     
     result = []
     for api_call in api_calls:
-        alerts = db.query(Alert).filter(
-            Alert.api_call_id == api_call.id
-        ).all()
+        alerts = api_call.alerts
+        links = api_call.st2_links
         
-        links = db.query(ST2ExecutionLink).filter(
-            ST2ExecutionLink.request_id == api_call.request_id
-        ).all()
-        
-        result.append({
-            "request_id": api_call.request_id,
-            "received_at": api_call.created_at.isoformat(),
-            "alert_count": len(alerts),
-            "st2_execution_count": len(links),
-            "alerts": [
-                {
-                    "name": a.alert_name,
-                    "severity": a.severity,
-                    "st2_workflow": a.st2_rule_matched
-                }
+        result.append(RecentExecution(
+            request_id=api_call.request_id,
+            received_at=api_call.created_at,
+            alert_count=len(alerts),
+            st2_execution_count=len(links),
+            alerts=[
+                RecentExecutionAlert(
+                    name=a.alert_name,
+                    severity=a.severity,
+                    st2_workflow=a.st2_rule_matched
+                )
                 for a in alerts
             ]
-        })
+        ))
     
-    return {"executions": result, "total": len(result)}
+    return RecentExecutionsResponse(executions=result, total=len(result))
 
 
-@router.get("/alerts/active")
-async def list_active_alerts(
+@router.get("/alerts/active", response_model=ActiveAlertsResponse)
+def list_active_alerts(
     db: Session = Depends(get_db)
-):
+) -> ActiveAlertsResponse:
     """List all active (firing) alerts.
     
     Returns:
-        dict: List of currently active alerts
+        ActiveAlertsResponse: Currently active alerts
     """
-    alerts = db.query(Alert).filter(
-        Alert.status == "firing"
+    # is_active mirrors status = 'firing' and is served by idx_alerts_active
+    alerts = db.query(Alert).options(
+        load_only(
+            Alert.fingerprint,
+            Alert.alert_name,
+            Alert.severity,
+            Alert.instance,
+            Alert.starts_at,
+            Alert.st2_rule_matched
+        )
+    ).filter(
+        Alert.is_active == true()
     ).order_by(
         Alert.created_at.desc()
     ).all()
     
-    return {
-        "active_alerts": [
-            {
-                "fingerprint": a.fingerprint,
-                "alert_name": a.alert_name,
-                "severity": a.severity,
-                "instance": a.instance,
-                "starts_at": a.starts_at.isoformat() if a.starts_at else None,
-                "st2_workflow": a.st2_rule_matched
-            }
+    return ActiveAlertsResponse(
+        active_alerts=[
+            ActiveAlert(
+                fingerprint=a.fingerprint,
+                alert_name=a.alert_name,
+                severity=a.severity,
+                instance=a.instance,
+                starts_at=a.starts_at,
+                st2_workflow=a.st2_rule_matched
+            )
             for a in alerts
         ],
-        "count": len(alerts)
-    }
+        count=len(alerts)
+    )
 
 
-@router.get("/st2/executions")
-async def list_st2_executions(
+@router.get("/st2/executions", response_model=ST2ExecutionsResponse)
+def list_st2_executions(
     limit: int = 50,
     db: Session = Depends(get_db)
-):
+) -> ST2ExecutionsResponse:
     """List all ST2 execution links.
     
     This shows all StackStorm executions triggered by PoundCake.
@@ -252,34 +343,40 @@ async def list_st2_executions(
         limit: Maximum number of results
     
     Returns:
-        dict: List of ST2 execution links with alert context
+        ST2ExecutionsResponse: ST2 execution links with alert context
     """
-    links = db.query(ST2ExecutionLink).order_by(
+    links = db.query(ST2ExecutionLink).options(
+        joinedload(ST2ExecutionLink.alert).load_only(
+            Alert.alert_name,
+            Alert.severity,
+            Alert.instance
+        )
+    ).order_by(
         ST2ExecutionLink.created_at.desc()
     ).limit(limit).all()
     
     result = []
     for link in links:
-        alert = db.query(Alert).filter(Alert.id == link.alert_id).first()
+        alert = link.alert
         
-        result.append({
-            "request_id": link.request_id,
-            "st2_execution_id": link.st2_execution_id,
-            "st2_workflow": link.st2_action_ref,
-            "st2_rule": link.st2_rule_ref,
-            "triggered_at": link.created_at.isoformat(),
-            "alert": {
-                "name": alert.alert_name if alert else None,
-                "severity": alert.severity if alert else None,
-                "instance": alert.instance if alert else None
-            } if alert else None
-        })
-    
-    return {"st2_executions": result, "count": len(result)}
+        result.append(ST2Execution(
+            request_id=link.request_id,
+            st2_execution_id=link.st2_execution_id,
+            st2_workflow=link.st2_action_ref,
+            st2_rule=link.st2_rule_ref,
+            triggered_at=link.created_at,
+            alert=ST2ExecutionAlert(
+                name=alert.alert_name,
+                severity=alert.severity,
+                instance=alert.instance
+            ) if alert else None
+        ))
+    
+    return ST2ExecutionsResponse(st2_executions=result, count=len(result))
 
 
 @router.get("/health")
-async def health_check(db: Session = Depends(get_db)):
+def health_check():
     """Health check endpoint.
     
     Returns:
@@ -287,7 +384,7 @@ async def health_check(db: Session = Depends(get_db)):
     """
     try:
         # Test database connection
-        db.execute("SELECT 1")
+        ping_db()
         
         return {
             "status": "healthy",
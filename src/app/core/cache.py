@@ -0,0 +1,67 @@
+"""Short-TTL response caching for frequently polled endpoints."""
+import functools
+import time
+from typing import Any, Callable
+import orjson
+import redis
+from pydantic import BaseModel
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+
+logger = get_logger(__name__)
+
+CACHE_KEY_PREFIX = "poundcake:cache:"
+
+
+def cached_response(key: str, ttl: int) -> Callable:
+    """
+    Cache an endpoint's response in a Redis hash for ``ttl`` seconds.
+
+    The hash stores ``{timestamp, body}`` and is kept past its TTL so the last
+    known value can be served if the endpoint itself fails (e.g. the database
+    is unavailable). Redis errors never fail the request; the endpoint is simply
+    called uncached.
+
+    Usage:
+        @router.get("/stats")
+        @cached_response("stats", ttl=10)
+        def get_statistics(db: Session = Depends(get_db)):
+            ...
+    """
+    cache_key = f"{CACHE_KEY_PREFIX}{key}"
+    client = get_redis()
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cached = None
+            try:
+                cached = client.hgetall(cache_key)
+            except redis.RedisError as e:
+                logger.warning(f"Cache read failed for {cache_key}: {e}")
+
+            if cached and time.time() - float(cached[b"timestamp"]) < ttl:
+                return orjson.loads(cached[b"body"])
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                if cached:
+                    logger.warning(f"Serving stale cache for {cache_key}", exc_info=True)
+                    return orjson.loads(cached[b"body"])
+                raise
+
+            body = result.model_dump(mode="json") if isinstance(result, BaseModel) else result
+            try:
+                client.hset(
+                    cache_key,
+                    mapping={"timestamp": time.time(), "body": orjson.dumps(body, default=str)},
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Cache write failed for {cache_key}: {e}")
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,7 @@
 """Database configuration and session management."""
 from typing import AsyncGenerator, Generator
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from app.core.config import settings
@@ -9,17 +10,36 @@ from app.core.config import settings
 engine = create_engine(
     settings.database_url,
     echo=settings.database_echo,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_pre_ping=settings.database_pool_pre_ping,
+    pool_use_lifo=settings.database_pool_use_lifo,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout,
+    pool_recycle=settings.database_pool_recycle,
+    # Use orjson for JSON columns (headers, bodies, labels, raw alert data)
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
 )
 
+
+@event.listens_for(engine, "connect")
+def set_utc_time_zone(dbapi_connection, connection_record) -> None:
+    """Pin MySQL/MariaDB sessions to UTC so TIMESTAMP columns round-trip naive UTC values."""
+    if engine.dialect.name in ("mysql", "mariadb"):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("SET time_zone = '+00:00'")
+        cursor.close()
+
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create base class for models
 Base = declarative_base()
 
+# Connectivity probe, built once and reused by health checks
+PING_SQL = text("SELECT 1")
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -37,6 +57,12 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def ping_db() -> None:
+    """Check database connectivity on a pooled connection, without an ORM session."""
+    with engine.connect() as conn:
+        conn.execute(PING_SQL)
+
+
 def init_db() -> None:
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
@@ -1,15 +1,26 @@
 """Middleware for request ID tracking and API call logging."""
 import time
 import uuid
-from typing import Callable
+from typing import Any, Callable, Dict
+import orjson
 from fastapi import Request, Response
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.database import SessionLocal
 from app.models.models import APICall
 
 logger = get_logger(__name__)
 
+# Health/liveness/readiness probes fire every few seconds per pod; they are not
+# logged to the database so they stay cheap and don't depend on DB availability
+SKIP_LOG_PATH_PREFIXES = ("/api/v1/health",)
+
+# Only these request headers are stored with the API call record
+LOGGED_HEADERS = {"user-agent", "x-request-id", "content-type", "content-length"}
+
 
 class RequestIDMiddleware(BaseHTTPMiddleware):
     """Middleware to add request ID to all requests and log ALL calls to database."""
@@ -23,73 +34,83 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         # Store request ID in request state for access in route handlers
         request.state.request_id = request_id
         
+        if request.url.path.startswith(SKIP_LOG_PATH_PREFIXES):
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+        
         # Add request ID to response headers
         start_time = time.time()
         
-        # Log ALL requests to database (including GET)
+        # Log ALL requests to database (including GET). A single session is held
+        # for the whole request: the row is committed up front (route handlers
+        # reference it by foreign key from their own sessions) and the same
+        # instance is updated once the response is ready. The session blocks,
+        # so every call that does I/O runs in the threadpool, off the event loop.
         api_call = None
+        db = None
         try:
             # Read request body for non-GET requests
             body_json = None
+            stored_body = None
             if request.method != "GET":
                 body = await request.body()
-                # Parse body as JSON if possible
+                # Parse body as JSON once and share it with route handlers
                 try:
-                    import json
-                    body_json = json.loads(body) if body else None
-                except:
+                    body_json = orjson.loads(body) if body else None
+                except orjson.JSONDecodeError:
                     body_json = None
+                request.state.json_body = body_json
+                
+                # Don't persist oversized payloads in the API call log
+                stored_body = cap_logged_body(body_json, len(body))
+                request.state.stored_body = stored_body
             
             # Create API call record for ALL requests
-            db = SessionLocal()
-            try:
-                api_call = APICall(
-                    request_id=request_id,
-                    method=request.method,
-                    path=str(request.url.path),
-                    headers=dict(request.headers),
-                    query_params=dict(request.query_params),
-                    body=body_json,
-                    client_host=request.client.host if request.client else None,
-                )
-                db.add(api_call)
-                db.commit()
-                db.refresh(api_call)
-                
-                # Store API call ID in request state
-                request.state.api_call_id = api_call.id
-                
-            finally:
-                db.close()
+            # Keep the instance loaded after commit so the post-response update
+            # doesn't re-SELECT it
+            db = SessionLocal(expire_on_commit=False)
+            api_call = APICall(
+                request_id=request_id,
+                method=request.method,
+                path=str(request.url.path),
+                headers=get_logged_headers(request),
+                query_params=dict(request.query_params),
+                body=stored_body,
+                client_host=request.client.host if request.client else None,
+            )
+            await run_in_threadpool(_insert_api_call, db, api_call)
+            
+            # Store API call ID in request state
+            request.state.api_call_id = api_call.id
                 
         except Exception as e:
             logger.error(f"Error logging API call to database: {e}", exc_info=True)
+            api_call = None
         
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate processing time
-        processing_time_ms = int((time.time() - start_time) * 1000)
-        
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Processing-Time-Ms"] = str(processing_time_ms)
-        
-        # Update API call record with response information
-        if api_call:
-            try:
-                db = SessionLocal()
+        try:
+            # Process request
+            response = await call_next(request)
+            
+            # Calculate processing time
+            processing_time_ms = int((time.time() - start_time) * 1000)
+            
+            # Add request ID to response headers
+            response.headers["X-Request-ID"] = request_id
+            response.headers["X-Processing-Time-Ms"] = str(processing_time_ms)
+            
+            # Update API call record with response information
+            if api_call:
                 try:
-                    api_call = db.query(APICall).filter(APICall.id == api_call.id).first()
-                    if api_call:
-                        api_call.status_code = response.status_code
-                        api_call.processing_time_ms = processing_time_ms
-                        api_call.completed_at = None  # Will be updated when response is sent
-                        db.commit()
-                finally:
-                    db.close()
-            except Exception as e:
-                logger.error(f"Error updating API call record: {e}", exc_info=True)
+                    api_call.status_code = response.status_code
+                    api_call.processing_time_ms = processing_time_ms
+                    api_call.completed_at = None  # Will be updated when response is sent
+                    await run_in_threadpool(db.commit)
+                except Exception as e:
+                    logger.error(f"Error updating API call record: {e}", exc_info=True)
+        finally:
+            if db is not None:
+                await run_in_threadpool(db.close)
         
         # Log request
         logger.info(
@@ -106,6 +127,25 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         return response
 
 
+def _insert_api_call(db: Session, api_call: APICall) -> None:
+    """Insert and commit an API call record (blocking)."""
+    db.add(api_call)
+    # flush() populates the primary key from the INSERT, no refresh needed
+    db.flush()
+    db.commit()
+
+
+def cap_logged_body(body_json: Any, size: int) -> Any:
+    """Get the body to store in an API call record.
+    
+    Bodies over ``api_call_max_body_bytes`` are replaced by a marker
+    recording their size.
+    """
+    if size <= settings.api_call_max_body_bytes:
+        return body_json
+    return {"truncated": True, "size": size}
+
+
 def get_request_id(request: Request) -> str:
     """Get request ID from request state."""
     return getattr(request.state, "request_id", "unknown")
@@ -114,3 +154,18 @@ def get_request_id(request: Request) -> str:
 def get_api_call_id(request: Request) -> int | None:
     """Get API call ID from request state."""
     return getattr(request.state, "api_call_id", None)
+
+
+def get_logged_headers(request: Request) -> Dict[str, str]:
+    """Get the subset of request headers worth storing in the API call log."""
+    return {k: v for k, v in request.headers.items() if k in LOGGED_HEADERS}
+
+
+def get_json_body(request: Request) -> Any:
+    """Get the JSON request body parsed by the middleware."""
+    return getattr(request.state, "json_body", None)
+
+
+def get_stored_body(request: Request) -> Any:
+    """Get the request body as stored in the API call log (size-capped)."""
+    return getattr(request.state, "stored_body", None)
@@ -0,0 +1,71 @@
+"""Redis connection pool and client access."""
+import time
+from datetime import datetime, timezone
+from typing import Dict
+import redis
+from app.core.config import settings
+
+# Create connection pool once; clients built from it share connections instead
+# of parsing the URL and opening a new socket on every call
+redis_pool = redis.ConnectionPool.from_url(
+    settings.redis_url,
+    max_connections=settings.redis_max_connections,
+    socket_timeout=settings.redis_socket_timeout,
+    socket_connect_timeout=settings.redis_socket_timeout,
+    health_check_interval=30,
+)
+
+
+def get_redis() -> redis.Redis:
+    """Get a Redis client backed by the shared connection pool."""
+    return redis.Redis(connection_pool=redis_pool)
+
+
+# Rolling record of alert creation times (fingerprint -> row created_at),
+# so "alerts in the last 24h" is a ZCOUNT instead of a table range scan
+RECENT_ALERTS_KEY = "poundcake:alerts:created"
+RECENT_ALERTS_WINDOW = 24 * 60 * 60
+
+
+def record_alerts_created(created: Dict[str, datetime]) -> None:
+    """Add alerts to the rolling recent-alerts set and trim expired entries.
+    
+    ``created`` maps fingerprint to the alert row's created_at (naive UTC),
+    which is used as the score. Alerts created before the window, such as a
+    long-firing alert that Alertmanager re-sends every repeat_interval, are
+    skipped so they aren't counted as recent again.
+    """
+    now = time.time()
+    cutoff = now - RECENT_ALERTS_WINDOW
+    scores = {}
+    for fingerprint, created_at in created.items():
+        created_ts = created_at.replace(tzinfo=timezone.utc).timestamp()
+        if created_ts >= cutoff:
+            scores[fingerprint] = created_ts
+    if not scores:
+        return
+    
+    pipe = get_redis().pipeline(transaction=False)
+    pipe.zadd(RECENT_ALERTS_KEY, scores, nx=True)
+    pipe.zremrangebyscore(RECENT_ALERTS_KEY, "-inf", cutoff)
+    pipe.execute()
+
+
+def count_recent_alerts() -> int:
+    """Count alerts first seen within the rolling window."""
+    return get_redis().zcount(RECENT_ALERTS_KEY, time.time() - RECENT_ALERTS_WINDOW, "+inf")
+
+
+# Celery worker heartbeats, written by each worker's WorkerHeartbeat bootstep and read by
+# /health instead of broadcasting an inspect() RPC to every worker
+CELERY_HEARTBEAT_KEY_PREFIX = "poundcake:celery:heartbeat:"
+
+
+def record_worker_heartbeat(hostname: str, ttl: int) -> None:
+    """Mark a Celery worker as alive for ``ttl`` seconds."""
+    get_redis().setex(f"{CELERY_HEARTBEAT_KEY_PREFIX}{hostname}", ttl, int(time.time()))
+
+
+def count_live_workers() -> int:
+    """Count Celery workers with an unexpired heartbeat."""
+    return sum(1 for _ in get_redis().scan_iter(match=f"{CELERY_HEARTBEAT_KEY_PREFIX}*"))
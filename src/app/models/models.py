@@ -13,10 +13,10 @@ NO MORE:
 
 MUCH SIMPLER!
 """
-from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, Integer, JSON, ForeignKey, Index, Boolean
+from sqlalchemy import Column, Computed, String, DateTime, Text, Integer, JSON, ForeignKey, Index, Boolean
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.models.types import CompressedJSON, UTCTimestamp, current_timestamp_ms
 
 
 # ==============================================================================
@@ -37,15 +37,27 @@ class APICall(Base):
     path = Column(String(500), nullable=False)
     headers = Column(JSON, nullable=True)
     query_params = Column(JSON, nullable=True)
-    body = Column(JSON, nullable=True)
+    body = Column(CompressedJSON, nullable=True)
     client_host = Column(String(100), nullable=True)
     status_code = Column(Integer, nullable=True)
     processing_time_ms = Column(Integer, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    completed_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCTimestamp, server_default=current_timestamp_ms(), nullable=False)
+    completed_at = Column(UTCTimestamp, nullable=True)
     
-    # Relationships
-    alerts = relationship("Alert", back_populates="api_call", cascade="all, delete-orphan")
+    # Relationships (raise_on_sql: query sites must load these explicitly with
+    # selectinload/joinedload, so a forgotten loader fails instead of an N+1)
+    alerts = relationship(
+        "Alert",
+        back_populates="api_call",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+    )
+    st2_links = relationship(
+        "ST2ExecutionLink",
+        primaryjoin="APICall.request_id == foreign(ST2ExecutionLink.request_id)",
+        viewonly=True,
+        lazy="raise_on_sql",
+    )
     
     __table_args__ = (
         Index("idx_api_calls_created_at", "created_at"),
@@ -67,33 +79,45 @@ class Alert(Base):
     api_call_id = Column(Integer, ForeignKey("poundcake_api_calls.id"), nullable=False)
     fingerprint = Column(String(64), unique=True, nullable=False, index=True)
     status = Column(String(20), nullable=False)
-    alert_name = Column(String(200), nullable=False, index=True)
+    # Maintained by the database; backs the narrow index for active-alert dashboards
+    is_active = Column(Boolean, Computed("status = 'firing'", persisted=True))
+    alert_name = Column(String(200), nullable=False)
     severity = Column(String(50), nullable=True, index=True)
-    instance = Column(String(200), nullable=True, index=True)
+    instance = Column(String(200), nullable=True)
     
-    # Alert data
-    labels = Column(JSON, nullable=True)
-    annotations = Column(JSON, nullable=True)
-    raw_data = Column(JSON, nullable=True)
+    # Alert data (compressed blobs; add a generated column if a label needs an index)
+    labels = Column(CompressedJSON, nullable=True)
+    annotations = Column(CompressedJSON, nullable=True)
+    raw_data = Column(CompressedJSON, nullable=True)
     
     # Timing
     starts_at = Column(DateTime, nullable=True)
     ends_at = Column(DateTime, nullable=True)
     
     # Which ST2 rule will handle this
-    st2_rule_matched = Column(String(200), nullable=True, index=True)
+    st2_rule_matched = Column(String(200), nullable=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(UTCTimestamp, server_default=current_timestamp_ms(), nullable=False)
+    updated_at = Column(
+        UTCTimestamp,
+        server_default=current_timestamp_ms(),
+        onupdate=current_timestamp_ms(),
+        nullable=False
+    )
     
     # Relationships
     api_call = relationship("APICall", back_populates="alerts")
-    executions = relationship("ST2ExecutionLink", back_populates="alert")
+    # Not read on any hot path; load explicitly where needed
+    executions = relationship("ST2ExecutionLink", back_populates="alert", lazy="raise_on_sql")
     
     __table_args__ = (
         Index("idx_alerts_created_at", "created_at"),
         Index("idx_alerts_rule_matched", "st2_rule_matched"),
+        # Serve filtered listings ordered by created_at without a filesort
+        Index("idx_alerts_status_created_at", "status", "created_at"),
+        Index("idx_alerts_name_severity_created_at", "alert_name", "severity", "created_at"),
+        Index("idx_alerts_active", "is_active", "severity", "created_at"),
     )
     
     def __repr__(self) -> str:
@@ -125,23 +149,27 @@ class ST2ExecutionLink(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     
     # PoundCake side
-    request_id = Column(String(36), nullable=False, index=True)  # Our request tracking
+    request_id = Column(String(36), nullable=False)  # Our request tracking
     alert_id = Column(Integer, ForeignKey("poundcake_alerts.id"), nullable=True)  # Which alert
     
     # StackStorm side
-    st2_execution_id = Column(String(100), nullable=False, index=True)  # ST2's execution_db.id
+    st2_execution_id = Column(String(24), nullable=False)  # ST2's execution_db.id (ObjectId hex)
     st2_rule_ref = Column(String(200), nullable=True)  # Which ST2 rule triggered
     st2_action_ref = Column(String(200), nullable=True)  # Which ST2 action ran
     
     # When we created this link
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(UTCTimestamp, server_default=current_timestamp_ms(), nullable=False)
     
     # Relationships
     alert = relationship("Alert", back_populates="executions")
     
     __table_args__ = (
-        Index("idx_st2_link_request_id", "request_id"),
+        # Covers the audit trail lookup (filter on request_id, join on alert_id,
+        # project st2_execution_id) without touching the table rows
+        Index("idx_st2_link_covering", "request_id", "alert_id", "st2_execution_id"),
+        # Reverse lookup from an ST2 execution back to PoundCake
         Index("idx_st2_link_st2_exec_id", "st2_execution_id"),
+        # InnoDB needs an index led by the foreign key column
         Index("idx_st2_link_alert_id", "alert_id"),
     )
     
@@ -150,7 +178,36 @@ class ST2ExecutionLink(Base):
 
 
 # ==============================================================================
-# THAT'S IT! Just 3 tables.
+# TASK LOG - Celery tasks queued by the alert API
+# ==============================================================================
+
+class TaskExecution(Base):
+    """Celery task queued by the alert API.
+    
+    Written in the same transaction as the rows the task will read, with the
+    task id assigned up front. The record tracks queuing only; progress and
+    results come from the Celery result backend.
+    """
+    
+    __tablename__ = "poundcake_task_executions"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String(36), unique=True, nullable=False)
+    task_name = Column(String(100), nullable=False)
+    alert_fingerprint = Column(String(64), nullable=True)  # Set for single-alert tasks
+    status = Column(String(20), nullable=False)  # pending, or failed if queuing failed
+    args = Column(JSON, nullable=True)
+    kwargs = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(UTCTimestamp, server_default=current_timestamp_ms(), nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<TaskExecution {self.task_name} {self.task_id} {self.status}>"
+
+
+# ==============================================================================
+# THAT'S IT! 3 tables, plus the task log.
 # ==============================================================================
 
 """
@@ -250,9 +307,11 @@ StackStorm's Role:
 QUERIES:
 
 -- Get all ST2 executions for a request
-SELECT * FROM execution_db e
-JOIN poundcake_st2_execution_link link ON e.id = link.st2_execution_id
-WHERE link.request_id = 'abc-123';
+SELECT link.st2_execution_id, e.action, e.status
+FROM poundcake_st2_execution_link link
+LEFT JOIN execution_db e ON e.id = link.st2_execution_id
+WHERE link.request_id = 'abc-123'
+  AND EXISTS (SELECT 1 FROM poundcake_alerts a WHERE a.id = link.alert_id);
 
 -- Get all alerts and their ST2 executions
 SELECT 
@@ -0,0 +1,79 @@
+"""Custom SQLAlchemy column types."""
+from typing import Any, Optional
+import orjson
+import zstandard
+from sqlalchemy import DateTime, LargeBinary
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+# Payloads at or below this size are stored as plain JSON bytes
+COMPRESSION_THRESHOLD = 4096
+
+# Every zstd frame starts with this magic number, which can't begin a JSON
+# document, so stored values are self-describing without a separate flag column
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Millisecond TIMESTAMP on MySQL/MariaDB (6 bytes vs. DATETIME's 8 without
+# precision); values are naive UTC, matching the session time zone set in
+# app.core.database. Only for server-generated times: TIMESTAMP can't hold
+# Alertmanager's 0001-01-01 "no end time" value.
+UTCTimestamp = DateTime().with_variant(mysql.TIMESTAMP(fsp=3), "mysql", "mariadb")
+
+
+class current_timestamp_ms(FunctionElement):
+    """Database-side current time, at UTCTimestamp's millisecond precision.
+
+    For server_default/onupdate, so timestamps are filled in by the database
+    instead of being sent as bind parameters on every row.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(current_timestamp_ms)
+def _compile_current_timestamp_ms(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(current_timestamp_ms, "mysql")
+@compiles(current_timestamp_ms, "mariadb")
+def _compile_current_timestamp_ms_mysql(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP(3)"
+
+
+_compressor = zstandard.ZstdCompressor(level=3)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON stored as bytes, zstd-compressed when larger than COMPRESSION_THRESHOLD.
+
+    Stored as LONGBLOB on MySQL/MariaDB.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine:
+        if dialect.name in ("mysql", "mariadb"):
+            return dialect.type_descriptor(mysql.LONGBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        data = orjson.dumps(value)
+        if len(data) > COMPRESSION_THRESHOLD:
+            return _compressor.compress(data)
+        return data
+
+    def process_result_value(self, value: Optional[bytes], dialect: Dialect) -> Any:
+        if value is None:
+            return None
+        if value[:4] == ZSTD_MAGIC:
+            value = _decompressor.decompress(value)
+        return orjson.loads(value)
@@ -66,8 +66,7 @@ class AlertResponse(BaseModel):
     severity: Optional[str]
     instance: Optional[str]
     labels: Dict[str, Any]
-    processing_status: str
-    task_id: Optional[str]
+    st2_rule_matched: Optional[str] = None
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
@@ -96,5 +95,66 @@ class StatsResponse(BaseModel):
     total_api_calls: int
     total_alerts: int
     alerts_by_status: Dict[str, int]
-    alerts_by_processing_status: Dict[str, int]
     recent_alerts: int
+
+
+# v1 listing schemas
+class RecentExecutionAlert(BaseModel):
+    """Alert summary within a recent webhook request."""
+    name: str
+    severity: Optional[str] = None
+    st2_workflow: Optional[str] = None
+
+
+class RecentExecution(BaseModel):
+    """Webhook request with its alerts and ST2 execution count."""
+    request_id: str
+    received_at: datetime
+    alert_count: int
+    st2_execution_count: int
+    alerts: List[RecentExecutionAlert]
+
+
+class RecentExecutionsResponse(BaseModel):
+    """Response for recent webhook requests."""
+    executions: List[RecentExecution]
+    total: int
+
+
+class ActiveAlert(BaseModel):
+    """Currently firing alert."""
+    fingerprint: str
+    alert_name: str
+    severity: Optional[str] = None
+    instance: Optional[str] = None
+    starts_at: Optional[datetime] = None
+    st2_workflow: Optional[str] = None
+
+
+class ActiveAlertsResponse(BaseModel):
+    """Response for active alerts."""
+    active_alerts: List[ActiveAlert]
+    count: int
+
+
+class ST2ExecutionAlert(BaseModel):
+    """Alert that triggered an ST2 execution."""
+    name: str
+    severity: Optional[str] = None
+    instance: Optional[str] = None
+
+
+class ST2Execution(BaseModel):
+    """ST2 execution triggered by PoundCake."""
+    request_id: str
+    st2_execution_id: str
+    st2_workflow: Optional[str] = None
+    st2_rule: Optional[str] = None
+    triggered_at: datetime
+    alert: Optional[ST2ExecutionAlert] = None
+
+
+class ST2ExecutionsResponse(BaseModel):
+    """Response for ST2 execution links."""
+    st2_executions: List[ST2Execution]
+    count: int
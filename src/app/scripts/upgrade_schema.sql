@@ -0,0 +1,77 @@
+-- Upgrade an existing PoundCake database to the current schema.
+--
+-- init_db() only creates missing tables; it never alters existing ones. Databases
+-- created before these changes need this script once:
+--   - compressed payload columns (LONGBLOB instead of JSON)
+--   - millisecond TIMESTAMP columns filled in by the database
+--   - the is_active generated column
+--   - the new composite/covering indexes, replacing the old single-column ones
+--   - st2_execution_id narrowed to an ObjectId (24 hex characters)
+--
+-- (The new poundcake_task_executions table is created by init_db() as usual.)
+--
+-- Each ALTER rebuilds its table (column type changes need a table copy) and blocks
+-- writes while it runs. Stop the API and the Celery workers first, and take a backup.
+--
+-- Run upgrade_schema_check.sql first; every count it reports must be 0.
+--
+-- Usage:
+--   mysql -u poundcake -p poundcake < src/app/scripts/upgrade_schema_check.sql
+--   mysql -u poundcake -p poundcake < src/app/scripts/upgrade_schema.sql
+--
+-- Afterwards, SHOW CREATE TABLE should match a fresh `make db-init` database.
+
+-- Stored DATETIME values are naive UTC. Convert them to TIMESTAMP as UTC too; the
+-- application pins its own sessions to the same time zone.
+SET time_zone = '+00:00';
+
+-- ------------------------------------------------------------------------------
+-- poundcake_api_calls
+-- ------------------------------------------------------------------------------
+
+-- body: existing JSON documents become their JSON text, which CompressedJSON reads
+-- as an uncompressed payload. Only new rows are compressed.
+ALTER TABLE poundcake_api_calls
+    MODIFY body LONGBLOB NULL,
+    MODIFY created_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    MODIFY completed_at TIMESTAMP(3) NULL DEFAULT NULL;
+
+-- ------------------------------------------------------------------------------
+-- poundcake_alerts
+-- ------------------------------------------------------------------------------
+
+-- updated_at becomes NOT NULL
+UPDATE poundcake_alerts SET updated_at = created_at WHERE updated_at IS NULL;
+
+-- labels/annotations/raw_data: converted like poundcake_api_calls.body; raw_data
+-- is recompressed the next time Alertmanager re-sends the alert.
+-- The dropped single-column indexes are covered by the new composites
+-- (alert_name) or were unused (instance, and st2_rule_matched, which
+-- idx_alerts_rule_matched already indexes).
+ALTER TABLE poundcake_alerts
+    ADD COLUMN is_active BOOL GENERATED ALWAYS AS (status = 'firing') STORED AFTER status,
+    MODIFY labels LONGBLOB NULL,
+    MODIFY annotations LONGBLOB NULL,
+    MODIFY raw_data LONGBLOB NULL,
+    MODIFY created_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    MODIFY updated_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    DROP INDEX ix_poundcake_alerts_alert_name,
+    DROP INDEX ix_poundcake_alerts_instance,
+    DROP INDEX ix_poundcake_alerts_st2_rule_matched,
+    ADD INDEX idx_alerts_status_created_at (status, created_at),
+    ADD INDEX idx_alerts_name_severity_created_at (alert_name, severity, created_at),
+    ADD INDEX idx_alerts_active (is_active, severity, created_at);
+
+-- ------------------------------------------------------------------------------
+-- poundcake_st2_execution_link
+-- ------------------------------------------------------------------------------
+
+-- idx_st2_link_covering replaces both request_id indexes; the st2_execution_id
+-- lookup is kept as idx_st2_link_st2_exec_id
+ALTER TABLE poundcake_st2_execution_link
+    MODIFY st2_execution_id VARCHAR(24) NOT NULL,
+    MODIFY created_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    DROP INDEX ix_poundcake_st2_execution_link_request_id,
+    DROP INDEX ix_poundcake_st2_execution_link_st2_execution_id,
+    DROP INDEX idx_st2_link_request_id,
+    ADD INDEX idx_st2_link_covering (request_id, alert_id, st2_execution_id);
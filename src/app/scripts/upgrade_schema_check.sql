@@ -0,0 +1,24 @@
+-- Pre-flight checks for upgrade_schema.sql. Read-only; run this first.
+--
+-- Every count must be 0 before upgrade_schema.sql is run. Fix or delete the
+-- reported rows otherwise: strict mode would abort the ALTERs part-way through,
+-- non-strict mode would silently truncate or zero the values.
+--
+-- Usage:
+--   mysql -u poundcake -p poundcake < src/app/scripts/upgrade_schema_check.sql
+
+-- Links whose st2_execution_id doesn't fit VARCHAR(24)
+SELECT COUNT(*) AS oversized_execution_ids
+FROM poundcake_st2_execution_link
+WHERE CHAR_LENGTH(st2_execution_id) > 24;
+
+-- Rows outside the TIMESTAMP range (1970-01-01 to 2038-01-19 UTC)
+SELECT
+    (SELECT COUNT(*) FROM poundcake_api_calls
+     WHERE created_at < '1970-01-02' OR created_at >= '2038-01-19'
+        OR completed_at < '1970-01-02' OR completed_at >= '2038-01-19')
+  + (SELECT COUNT(*) FROM poundcake_alerts
+     WHERE created_at < '1970-01-02' OR created_at >= '2038-01-19'
+        OR updated_at < '1970-01-02' OR updated_at >= '2038-01-19')
+  + (SELECT COUNT(*) FROM poundcake_st2_execution_link
+     WHERE created_at < '1970-01-02' OR created_at >= '2038-01-19') AS out_of_range_timestamps;
@@ -11,13 +11,23 @@ Now:
 - Trigger ST2 via API
 - Store link (request_id ↔ st2_execution_id)
 """
-from celery import Celery
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import functools
+import ahocorasick
+from celery import Celery, bootsteps
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_init
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
+import orjson
+import redis
 import requests
+from requests.adapters import HTTPAdapter
 import os
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, engine
+from app.core.redis import record_worker_heartbeat
 from app.models.models import Alert, ST2ExecutionLink
 
 
@@ -32,11 +42,77 @@ celery_app = Celery(
 ST2_API_URL = os.getenv("ST2_API_URL", "http://localhost:9101/v1")
 ST2_API_KEY = os.getenv("ST2_API_KEY", "")
 
+ST2_MAX_CONCURRENCY = int(os.getenv("ST2_MAX_CONCURRENCY", "16"))
+ST2_TRIGGER_TIMEOUT = 30  # seconds per execution request
+
+# Task time limits (seconds). The hard limit leaves ST2 calls still in flight
+# at the soft limit time to return and have their links stored.
+TASK_SOFT_TIME_LIMIT = 270
+TASK_TIME_LIMIT = TASK_SOFT_TIME_LIMIT + ST2_TRIGGER_TIMEOUT + 30
+
+# Alerts handled by one process_alert_batch task: even if every ST2 call takes
+# the full ST2_TRIGGER_TIMEOUT, a batch finishes inside the soft time limit
+ALERT_BATCH_SIZE = ST2_MAX_CONCURRENCY * (TASK_SOFT_TIME_LIMIT // ST2_TRIGGER_TIMEOUT - 1)
+
+# Shared HTTP session for StackStorm: keeps connections alive across calls
+# instead of opening a new TCP (and TLS) connection per alert
+st2_session = requests.Session()
+st2_session.headers.update({
+    "St2-Api-Key": ST2_API_KEY,
+    "Content-Type": "application/json"
+})
+_st2_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=ST2_MAX_CONCURRENCY)
+st2_session.mount("http://", _st2_adapter)
+st2_session.mount("https://", _st2_adapter)
+
+# Alert processing runs on its own queue
+ALERT_QUEUE = "alerts"
+
+# Worker heartbeat for the API health check (seconds)
+HEARTBEAT_INTERVAL = 10
+HEARTBEAT_TTL = 30
+
+
+# Map alert name patterns to ST2 workflows (earlier entries win when several match)
+ST2_WORKFLOW_MAP = {
+    "HostDown": "remediation.host_down_workflow",
+    "NodeDown": "remediation.host_down_workflow",
+    "HighMemory": "remediation.memory_check_workflow",
+    "HighCPU": "remediation.cpu_check_workflow",
+    "DiskFull": "remediation.disk_cleanup_workflow",
+    "ServiceDown": "remediation.service_restart_workflow",
+}
+
+# Fallback workflows by severity
+ST2_SEVERITY_WORKFLOWS = {
+    "critical": "remediation.critical_alert_workflow",
+    "warning": "remediation.warning_alert_workflow",
+}
+ST2_DEFAULT_WORKFLOW = "remediation.default_workflow"
+
+# Aho-Corasick automaton over the patterns: finds every pattern contained in an
+# alert name in a single pass, however many patterns there are
+_workflow_matcher = ahocorasick.Automaton()
+for _priority, (_pattern, _workflow) in enumerate(ST2_WORKFLOW_MAP.items()):
+    _workflow_matcher.add_word(_pattern, (_priority, _workflow))
+_workflow_matcher.make_automaton()
+
+
+@worker_process_init.connect
+def reset_db_pool(**kwargs) -> None:
+    """Give each forked worker process its own database connections.
+    
+    The engine (and its compiled statement cache) is created at import in the
+    parent; connections it may hold must not be shared across processes.
+    """
+    engine.dispose(close=False)
+
 
 def determine_st2_workflow(alert_data: Dict[str, Any]) -> str:
     """Determine which StackStorm workflow to trigger.
     
-    This is simple pattern matching. Customize based on your ST2 workflows.
+    This is simple pattern matching. Customize ST2_WORKFLOW_MAP based on your
+    ST2 workflows.
     
     Examples:
     - HostDown → remediation.host_down_workflow
@@ -44,31 +120,56 @@ def determine_st2_workflow(alert_data: Dict[str, Any]) -> str:
     - DiskFull → remediation.disk_cleanup_workflow
     """
     labels = alert_data.get("labels", {})
-    alert_name = labels.get("alertname", "")
-    severity = labels.get("severity", "")
-    
-    # Map alert patterns to ST2 workflows
-    workflow_map = {
-        "HostDown": "remediation.host_down_workflow",
-        "NodeDown": "remediation.host_down_workflow",
-        "HighMemory": "remediation.memory_check_workflow",
-        "HighCPU": "remediation.cpu_check_workflow",
-        "DiskFull": "remediation.disk_cleanup_workflow",
-        "ServiceDown": "remediation.service_restart_workflow",
-    }
+    return _determine_st2_workflow_cached(
+        labels.get("alertname", ""),
+        labels.get("severity", "")
+    )
+
+
+@functools.lru_cache(maxsize=2048)
+def _determine_st2_workflow_cached(alert_name: str, severity: str) -> str:
+    """Resolve the workflow for an (alertname, severity) pair.
     
-    # Check for exact matches
-    for pattern, workflow in workflow_map.items():
-        if pattern in alert_name:
-            return workflow
+    Memoized: the mapping is a module constant, and the same alert names
+    arrive over and over.
+    """
+    # Check for pattern matches
+    matches = [match for _, match in _workflow_matcher.iter(alert_name)]
+    if matches:
+        return min(matches)[1]
     
     # Fallback based on severity
-    if severity == "critical":
-        return "remediation.critical_alert_workflow"
-    elif severity == "warning":
-        return "remediation.warning_alert_workflow"
-    else:
-        return "remediation.default_workflow"
+    return ST2_SEVERITY_WORKFLOWS.get(severity, ST2_DEFAULT_WORKFLOW)
+
+
+def build_st2_params(alert: Alert, request_id: str) -> Dict[str, Any]:
+    """Build StackStorm execution parameters for an alert."""
+    return {
+        "alert_name": alert.alert_name,
+        "instance": alert.instance,
+        "severity": alert.severity,
+        "fingerprint": alert.fingerprint,
+        "labels": alert.labels,
+        "annotations": alert.annotations,
+        "poundcake_request_id": request_id,  # ← Pass request_id to ST2
+        "alert_data": alert.raw_data or {}
+    }
+
+
+def trigger_st2_workflow(st2_workflow: str, st2_params: Dict[str, Any]) -> requests.Response:
+    """Start a StackStorm execution over the shared session.
+
+    The body is pre-encoded with orjson; the session already sends
+    Content-Type: application/json.
+    """
+    return st2_session.post(
+        f"{ST2_API_URL}/executions",
+        data=orjson.dumps({
+            "action": st2_workflow,
+            "parameters": st2_params
+        }),
+        timeout=ST2_TRIGGER_TIMEOUT
+    )
 
 
 @celery_app.task(name='process_alert')
@@ -103,34 +204,11 @@ def process_alert(alert_id: int, request_id: str):
         print(f"→ Processing alert: {alert.alert_name}")
         print(f"→ Triggering ST2 workflow: {st2_workflow}")
         
-        # Prepare ST2 execution parameters
-        st2_params = {
-            "alert_name": alert.alert_name,
-            "instance": alert.instance,
-            "severity": alert.severity,
-            "fingerprint": alert.fingerprint,
-            "labels": alert.labels,
-            "annotations": alert.annotations,
-            "poundcake_request_id": request_id,  # ← Pass request_id to ST2
-            "alert_data": alert_data
-        }
-        
         # Call StackStorm API
-        response = requests.post(
-            f"{ST2_API_URL}/executions",
-            json={
-                "action": st2_workflow,
-                "parameters": st2_params
-            },
-            headers={
-                "St2-Api-Key": ST2_API_KEY,
-                "Content-Type": "application/json"
-            },
-            timeout=30
-        )
+        response = trigger_st2_workflow(st2_workflow, build_st2_params(alert, request_id))
         
         if response.status_code in [200, 201]:
-            st2_data = response.json()
+            st2_data = orjson.loads(response.content)
             st2_execution_id = st2_data.get("id")
             
             # Store the link
@@ -174,6 +252,164 @@ def process_alert(alert_id: int, request_id: str):
         db.close()
 
 
+@celery_app.task(name='process_alert_batch')
+def process_alert_batch(alert_ids: List[int], request_id: str):
+    """Process the alerts from one webhook.
+    
+    The webhook enqueues this once per request. Batches larger than
+    ALERT_BATCH_SIZE are split: this task keeps the first ALERT_BATCH_SIZE
+    alerts and queues the rest as further tasks, so each one fits in the soft
+    time limit. The task loads its alerts with one query and triggers the ST2
+    workflows concurrently over the shared session (up to ST2_MAX_CONCURRENCY
+    at a time).
+    
+    Execution links are committed as ST2 calls return, so a started
+    execution is never left without its link if the task is cut short: at
+    the soft time limit no further calls are started, and the ones in flight
+    are waited for and their links stored.
+    
+    Args:
+        alert_ids: Database IDs of the alerts received in one webhook
+        request_id: PoundCake request_id for tracking
+    
+    Returns:
+        dict: Counts of triggered and failed alerts
+    """
+    if len(alert_ids) > ALERT_BATCH_SIZE:
+        for start in range(ALERT_BATCH_SIZE, len(alert_ids), ALERT_BATCH_SIZE):
+            process_alert_batch.apply_async(
+                args=[alert_ids[start:start + ALERT_BATCH_SIZE], request_id]
+            )
+        alert_ids = alert_ids[:ALERT_BATCH_SIZE]
+    
+    db: Session = SessionLocal()
+    
+    # (link row, alert update) pairs for started executions not yet committed
+    pending: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    triggered = 0
+    failed = 0
+    
+    def collect(job: Tuple[int, str, Dict[str, Any]], future: Future) -> None:
+        nonlocal failed
+        alert_id, st2_workflow, _ = job
+        st2_execution_id, error = future.result()
+        if error:
+            print(f"✗ Alert {alert_id}: {error}")
+            failed += 1
+            return
+        pending.append((
+            {
+                "request_id": request_id,
+                "alert_id": alert_id,
+                "st2_execution_id": st2_execution_id,
+                "st2_action_ref": st2_workflow
+            },
+            {"id": alert_id, "st2_rule_matched": st2_workflow}
+        ))
+    
+    def save_pending() -> None:
+        nonlocal triggered, failed
+        if not pending:
+            return
+        try:
+            db.execute(insert(ST2ExecutionLink), [link for link, _ in pending])
+            db.execute(update(Alert), [rule for _, rule in pending])
+            db.commit()
+            triggered += len(pending)
+        except SoftTimeLimitExceeded:
+            # Keep the rows pending; the soft-limit handler saves them
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            failed += len(pending)
+            # The executions exist in ST2 regardless; log them so the links
+            # can be restored by hand
+            for link, _ in pending:
+                print(
+                    f"✗ Link not stored: {request_id} ↔ {link['st2_execution_id']} "
+                    f"(alert {link['alert_id']}): {e}"
+                )
+        pending.clear()
+    
+    pool = None
+    try:
+        alerts = db.query(Alert).filter(Alert.id.in_(alert_ids)).all()
+        if len(alerts) < len(alert_ids):
+            print(f"✗ {len(alert_ids) - len(alerts)} alerts not found for request {request_id}")
+        
+        # Build everything from the ORM objects up front; worker threads only do HTTP
+        jobs = []
+        for alert in alerts:
+            st2_workflow = determine_st2_workflow(alert.raw_data or {})
+            jobs.append((alert.id, st2_workflow, build_st2_params(alert, request_id)))
+        
+        def trigger(job: Tuple[int, str, Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
+            _, st2_workflow, st2_params = job
+            try:
+                response = trigger_st2_workflow(st2_workflow, st2_params)
+                if response.status_code in [200, 201]:
+                    return orjson.loads(response.content).get("id"), None
+            except Exception as e:
+                return None, str(e)
+            return None, f"ST2 API returned {response.status_code}"
+        
+        print(f"→ Triggering {len(jobs)} ST2 workflows for request {request_id}")
+        
+        if jobs:
+            pool = ThreadPoolExecutor(max_workers=min(ST2_MAX_CONCURRENCY, len(jobs)))
+            futures = {pool.submit(trigger, job): job for job in jobs}
+            try:
+                # Store the links of every call that has returned in one commit
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(futures.pop(future), future)
+                    save_pending()
+            except SoftTimeLimitExceeded:
+                # Start no new executions, then record the ones already in
+                # flight (each is bounded by ST2_TRIGGER_TIMEOUT)
+                not_started = [future for future in futures if future.cancel()]
+                for future in not_started:
+                    futures.pop(future)
+                done, _ = wait(futures)
+                for future in done:
+                    collect(futures.pop(future), future)
+                save_pending()
+                print(
+                    f"✗ Soft time limit hit for request {request_id}: "
+                    f"{len(not_started)} alerts not triggered"
+                )
+                return {
+                    "success": False,
+                    "triggered": triggered,
+                    "failed": failed + len(not_started),
+                    "error": "soft time limit exceeded"
+                }
+        
+        print(f"✓ {triggered} ST2 executions created, {failed} failed")
+        
+        return {
+            "success": failed == 0,
+            "triggered": triggered,
+            "failed": failed
+        }
+        
+    except Exception as e:
+        print(f"✗ Error processing alert batch: {e}")
+        db.rollback()
+        save_pending()
+        return {
+            "success": False,
+            "triggered": triggered,
+            "error": str(e)
+        }
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        db.close()
+
+
 @celery_app.task(name='query_st2_execution_status')
 def query_st2_execution_status(st2_execution_id: str):
     """Query StackStorm execution status.
@@ -184,17 +420,21 @@ def query_st2_execution_status(st2_execution_id: str):
         st2_execution_id: StackStorm execution ID
     
     Returns:
-        dict: Execution status from ST2
+        dict: Execution id and status from ST2 (the full execution, including
+        its result, stays in ST2's execution_db)
     """
     try:
-        response = requests.get(
+        response = st2_session.get(
             f"{ST2_API_URL}/executions/{st2_execution_id}",
-            headers={"St2-Api-Key": ST2_API_KEY},
             timeout=10
         )
         
         if response.status_code == 200:
-            return response.json()
+            execution = orjson.loads(response.content)
+            return {
+                "st2_execution_id": st2_execution_id,
+                "status": execution.get("status")
+            }
         else:
             return {"error": f"ST2 API returned {response.status_code}"}
             
@@ -202,16 +442,61 @@ def query_st2_execution_status(st2_execution_id: str):
         return {"error": str(e)}
 
 
+class WorkerHeartbeat(bootsteps.StartStopStep):
+    """Write this worker's heartbeat key from the worker's main process.
+    
+    Runs on the worker's own timer rather than as a task, so a worker whose
+    pool is busy with long batches still reports itself alive, and every
+    worker reports (not just whichever picked up a scheduled task). The API
+    health check counts unexpired heartbeat keys instead of calling inspect().
+    """
+    
+    requires = {'celery.worker.components:Timer'}
+    
+    def __init__(self, worker, **kwargs):
+        super().__init__(worker, **kwargs)
+        self.tref = None
+    
+    def start(self, worker):
+        self.beat(worker.hostname)
+        self.tref = worker.timer.call_repeatedly(
+            HEARTBEAT_INTERVAL, self.beat, (worker.hostname,), priority=10
+        )
+    
+    def stop(self, worker):
+        if self.tref is not None:
+            self.tref.cancel()
+            self.tref = None
+    
+    def beat(self, hostname: str) -> None:
+        try:
+            record_worker_heartbeat(hostname, HEARTBEAT_TTL)
+        except redis.RedisError as e:
+            print(f"✗ Failed to record worker heartbeat: {e}")
+
+
+celery_app.steps['worker'].add(WorkerHeartbeat)
+
+
 # Celery configuration
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    # msgpack is smaller and faster than JSON; JSON is still accepted so
+    # messages queued before an upgrade can be consumed
+    task_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_serializer='msgpack',
+    result_accept_content=['msgpack', 'json'],
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
-    task_time_limit=300,  # 5 minutes max per task
-    task_soft_time_limit=270,
+    task_time_limit=TASK_TIME_LIMIT,
+    task_soft_time_limit=TASK_SOFT_TIME_LIMIT,
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    # Detect dead broker connections instead of hanging on a half-open socket
+    broker_transport_options={'socket_keepalive': True, 'socket_timeout': 5},
+    task_routes={
+        'process_alert': {'queue': ALERT_QUEUE},
+        'process_alert_batch': {'queue': ALERT_QUEUE},
+    },
 )
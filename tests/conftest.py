@@ -0,0 +1,18 @@
+"""Shared test fixtures."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+
+
+@pytest.fixture
+def engine():
+    """In-memory database shared across threads."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
@@ -0,0 +1,125 @@
+"""Query-count tests for the audit trail endpoints."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from app.core.database import get_db
+from app.api.v1 import webhook
+from app.models.models import APICall, Alert, ST2ExecutionLink
+
+REQUEST_ID = "abc-123"
+
+
+@pytest.fixture
+def seeded(engine):
+    """One webhook request with three alerts, each linked to an ST2 execution."""
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        api_call = APICall(request_id=REQUEST_ID, method="POST", path="/api/v1/webhook")
+        db.add(api_call)
+        db.flush()
+        for i in range(3):
+            alert = Alert(
+                api_call_id=api_call.id,
+                fingerprint=f"fp-{i}",
+                status="firing",
+                alert_name=f"HostDown{i}",
+            )
+            db.add(alert)
+            db.flush()
+            db.add(ST2ExecutionLink(
+                request_id=REQUEST_ID,
+                alert_id=alert.id,
+                st2_execution_id=f"exec-{i}",
+            ))
+        db.commit()
+
+
+@pytest.fixture
+def sql_statements(engine):
+    """Record every SQL statement executed against the engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def client(engine):
+    """Test client for the v1 router backed by the in-memory database."""
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(webhook.router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def test_request_status_query_count(client, seeded, sql_statements):
+    """Test that the audit trail loads in a fixed number of queries."""
+    response = client.get(f"/api/v1/status/{REQUEST_ID}")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["alerts"]) == 3
+    assert len(data["stackstorm_executions"]) == 3
+    assert len(sql_statements) <= 3
+
+
+def test_request_status_not_found(client, seeded):
+    """Test that unknown request IDs return 404."""
+    response = client.get("/api/v1/status/does-not-exist")
+    assert response.status_code == 404
+
+
+def test_request_status_skips_payload_columns(client, seeded, sql_statements):
+    """Test that the audit trail doesn't fetch the stored request and alert payloads."""
+    response = client.get(f"/api/v1/status/{REQUEST_ID}")
+    assert response.status_code == 200
+    for statement in sql_statements:
+        assert "raw_data" not in statement
+        assert "poundcake_api_calls.body" not in statement
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/executions/recent",
+    "/api/v1/alerts/active",
+    "/api/v1/st2/executions",
+])
+def test_listings_skip_payload_columns(client, seeded, sql_statements, path):
+    """Test that the listing endpoints don't fetch the stored request and alert payloads."""
+    response = client.get(path)
+    assert response.status_code == 200
+    for statement in sql_statements:
+        assert "raw_data" not in statement
+        assert "labels" not in statement
+        assert "annotations" not in statement
+        assert "poundcake_api_calls.body" not in statement
+
+
+def test_listings_response_shape(client, seeded):
+    """Test that the listing endpoints serialize through their response models."""
+    executions = client.get("/api/v1/executions/recent").json()
+    assert executions["total"] == 1
+    assert executions["executions"][0]["request_id"] == REQUEST_ID
+    assert executions["executions"][0]["alert_count"] == 3
+    assert executions["executions"][0]["st2_execution_count"] == 3
+
+    active = client.get("/api/v1/alerts/active").json()
+    assert active["count"] == 3
+    assert {a["fingerprint"] for a in active["active_alerts"]} == {"fp-0", "fp-1", "fp-2"}
+
+    links = client.get("/api/v1/st2/executions").json()
+    assert links["count"] == 3
+    assert {link["alert"]["name"] for link in links["st2_executions"]} == {"HostDown0", "HostDown1", "HostDown2"}
@@ -0,0 +1,116 @@
+"""Tests for the Redis-backed response cache."""
+import time
+from datetime import datetime
+import pytest
+import redis
+from app.core import cache
+from app.schemas.schemas import HealthResponse
+
+
+class FakeRedis:
+    """In-memory stand-in for the two hash commands the cache uses."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.down = False
+
+    def hgetall(self, key):
+        if self.down:
+            raise redis.ConnectionError("Redis is down")
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, mapping):
+        if self.down:
+            raise redis.ConnectionError("Redis is down")
+        self.hashes[key] = {
+            k.encode(): v if isinstance(v, bytes) else str(v).encode()
+            for k, v in mapping.items()
+        }
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Patch the cache module to use an in-memory Redis."""
+    client = FakeRedis()
+    monkeypatch.setattr(cache, "get_redis", lambda: client)
+    return client
+
+
+def make_endpoint(ttl=10):
+    """Build a cached endpoint that counts its calls and can be made to fail."""
+    state = {"calls": 0, "fail": False}
+
+    @cache.cached_response("test", ttl=ttl)
+    def endpoint():
+        state["calls"] += 1
+        if state["fail"]:
+            raise RuntimeError("database unavailable")
+        return {"calls": state["calls"]}
+
+    return endpoint, state
+
+
+def expire(client):
+    """Age the cached entry past any TTL."""
+    client.hashes["poundcake:cache:test"][b"timestamp"] = str(time.time() - 3600).encode()
+
+
+def test_hit_within_ttl(fake_redis):
+    """Test that a fresh entry is served without calling the endpoint."""
+    endpoint, state = make_endpoint()
+    assert endpoint() == {"calls": 1}
+    assert endpoint() == {"calls": 1}
+    assert state["calls"] == 1
+
+
+def test_miss_after_ttl(fake_redis):
+    """Test that an expired entry is refreshed from the endpoint."""
+    endpoint, state = make_endpoint()
+    endpoint()
+    expire(fake_redis)
+    assert endpoint() == {"calls": 2}
+    assert endpoint() == {"calls": 2}
+
+
+def test_stale_fallback_on_error(fake_redis):
+    """Test that the last cached value is served when the endpoint fails."""
+    endpoint, state = make_endpoint()
+    endpoint()
+    expire(fake_redis)
+    state["fail"] = True
+    assert endpoint() == {"calls": 1}
+
+
+def test_error_without_cache_propagates(fake_redis):
+    """Test that endpoint errors propagate when nothing is cached."""
+    endpoint, state = make_endpoint()
+    state["fail"] = True
+    with pytest.raises(RuntimeError):
+        endpoint()
+
+
+def test_redis_down_passthrough(fake_redis):
+    """Test that the endpoint is called uncached when Redis is unavailable."""
+    endpoint, state = make_endpoint()
+    fake_redis.down = True
+    assert endpoint() == {"calls": 1}
+    assert endpoint() == {"calls": 2}
+
+
+def test_pydantic_response_cached_as_json(fake_redis):
+    """Test that model responses are cached in their JSON form."""
+
+    @cache.cached_response("test", ttl=10)
+    def endpoint():
+        return HealthResponse(
+            status="healthy",
+            version="1.0.0",
+            database="healthy",
+            redis="healthy",
+            celery="healthy",
+            timestamp=datetime(2026, 1, 1, 12, 0, 0),
+        )
+
+    first = endpoint()
+    assert isinstance(first, HealthResponse)
+    assert endpoint() == first.model_dump(mode="json")
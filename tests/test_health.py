@@ -0,0 +1,121 @@
+"""Tests for the health check and statistics endpoints."""
+from datetime import datetime, timedelta
+import fnmatch
+import pytest
+import redis
+from sqlalchemy.orm import sessionmaker
+from app.api import health
+from app.core import redis as core_redis
+from app.core.redis import CELERY_HEARTBEAT_KEY_PREFIX
+from app.models.models import APICall, Alert
+
+
+class FakeRedis:
+    """In-memory stand-in for the commands the health check uses."""
+
+    def __init__(self):
+        self.keys = set()
+        self.down = False
+
+    def ping(self):
+        if self.down:
+            raise redis.ConnectionError("Redis is down")
+        return True
+
+    def scan_iter(self, match):
+        if self.down:
+            raise redis.ConnectionError("Redis is down")
+        return iter([k for k in self.keys if fnmatch.fnmatch(k, match)])
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Patch the health check to use an in-memory Redis and a reachable database."""
+    client = FakeRedis()
+    monkeypatch.setattr(health, "get_redis", lambda: client)
+    monkeypatch.setattr(core_redis, "get_redis", lambda: client)
+    monkeypatch.setattr(health, "ping_db", lambda: None)
+    return client
+
+
+def test_health_counts_worker_heartbeats(fake_redis):
+    """Test that every worker with a heartbeat key is counted."""
+    fake_redis.keys = {
+        f"{CELERY_HEARTBEAT_KEY_PREFIX}worker-1",
+        f"{CELERY_HEARTBEAT_KEY_PREFIX}worker-2",
+        "poundcake:alerts:created",
+    }
+    result = health.health_check.__wrapped__()
+    assert result.status == "healthy"
+    assert result.celery == "healthy (2 workers)"
+
+
+def test_health_degraded_without_heartbeats(fake_redis):
+    """Test that no live heartbeats report the service as degraded."""
+    result = health.health_check.__wrapped__()
+    assert result.status == "degraded"
+    assert result.celery == "no workers available"
+
+
+def test_health_unhealthy_when_redis_down(fake_redis):
+    """Test that an unreachable Redis fails both the Redis and worker checks."""
+    fake_redis.down = True
+    result = health.health_check.__wrapped__()
+    assert result.status == "unhealthy"
+    assert result.redis.startswith("unhealthy")
+    assert result.celery.startswith("unhealthy")
+
+
+@pytest.fixture
+def db(engine):
+    """Session with two API calls and alerts in each status."""
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(APICall(id=1, request_id="req-1", method="POST", path="/api/v1/webhook"))
+        db.add(APICall(id=2, request_id="req-2", method="GET", path="/api/v1/alerts"))
+        now = datetime.utcnow()
+        for i, (status, age) in enumerate([
+            ("firing", timedelta(hours=1)),
+            ("firing", timedelta(hours=2)),
+            ("resolved", timedelta(hours=3)),
+            ("resolved", timedelta(days=2)),
+            ("resolved", timedelta(days=3)),
+        ]):
+            db.add(Alert(
+                api_call_id=1,
+                fingerprint=f"fp-{i}",
+                status=status,
+                alert_name="HostDown",
+                created_at=now - age,
+            ))
+        db.commit()
+        yield db
+
+
+def test_stats_groups_alerts_by_status(db, monkeypatch):
+    """Test that alert totals are pivoted from the per-status counts."""
+    monkeypatch.setattr(health, "count_recent_alerts", lambda: 7)
+    result = health.get_statistics.__wrapped__(db)
+    assert result.total_api_calls == 2
+    assert result.total_alerts == 5
+    assert result.alerts_by_status == {"firing": 2, "resolved": 3}
+    assert result.recent_alerts == 7
+
+
+def test_stats_recent_alerts_fallback(db, monkeypatch):
+    """Test that recent alerts are counted in the database when Redis is unavailable."""
+    def count_recent_alerts():
+        raise redis.ConnectionError("Redis is down")
+
+    monkeypatch.setattr(health, "count_recent_alerts", count_recent_alerts)
+    result = health.get_statistics.__wrapped__(db)
+    assert result.recent_alerts == 3
+
+
+def test_stats_empty(engine, monkeypatch):
+    """Test that an empty database reports zero totals."""
+    monkeypatch.setattr(health, "count_recent_alerts", lambda: 0)
+    with sessionmaker(bind=engine)() as db:
+        result = health.get_statistics.__wrapped__(db)
+    assert result.total_alerts == 0
+    assert result.alerts_by_status == {}
@@ -0,0 +1,108 @@
+"""Tests for alert storage and dispatch selection."""
+from datetime import datetime
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+from app.api.ingest import _upsert_statement, upsert_alerts
+from app.models.models import APICall, Alert
+
+
+@pytest.fixture
+def db(engine):
+    """Session with one API call for the alerts to reference."""
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(APICall(id=1, request_id="req-1", method="POST", path="/api/v1/webhook"))
+        db.commit()
+        yield db
+
+
+def row(fingerprint, status="firing", **overrides):
+    """Alert row as the webhook handlers build it."""
+    values = {
+        "api_call_id": 1,
+        "fingerprint": fingerprint,
+        "status": status,
+        "alert_name": "HostDown",
+        "severity": "critical",
+        "instance": "node-1",
+        "labels": {"alertname": "HostDown"},
+        "annotations": None,
+        "raw_data": {"fingerprint": fingerprint, "status": status},
+        "starts_at": datetime(2026, 1, 1),
+        "ends_at": None,
+    }
+    values.update(overrides)
+    return values
+
+
+def alert_id(db, fingerprint):
+    """Id of the stored alert with this fingerprint."""
+    return db.scalar(select(Alert.id).where(Alert.fingerprint == fingerprint))
+
+
+def test_new_alert_dispatched(db):
+    """Test that an alert seen for the first time is dispatched."""
+    alert_ids, created = upsert_alerts(db, [row("fp-new")])
+    assert alert_ids == [alert_id(db, "fp-new")]
+    assert set(created) == {"fp-new"}
+
+
+def test_repeat_firing_not_dispatched(db):
+    """Test that Alertmanager's repeat notification of a firing alert isn't dispatched."""
+    upsert_alerts(db, [row("fp-1")])
+    alert_ids, created = upsert_alerts(db, [row("fp-1")])
+    assert alert_ids == []
+    assert set(created) == {"fp-1"}
+
+
+def test_resolved_to_firing_dispatched(db):
+    """Test that a resolved alert that fires again is dispatched."""
+    upsert_alerts(db, [row("fp-1")])
+    upsert_alerts(db, [row("fp-1", status="resolved")])
+    alert_ids, _ = upsert_alerts(db, [row("fp-1")])
+    assert alert_ids == [alert_id(db, "fp-1")]
+
+
+def test_firing_to_resolved_not_dispatched(db):
+    """Test that a resolved notification is stored but not dispatched."""
+    upsert_alerts(db, [row("fp-1")])
+    alert_ids, _ = upsert_alerts(db, [row("fp-1", status="resolved", ends_at=datetime(2026, 1, 2))])
+    assert alert_ids == []
+    alert = db.scalars(select(Alert).where(Alert.fingerprint == "fp-1")).one()
+    assert alert.status == "resolved"
+    assert alert.ends_at == datetime(2026, 1, 2)
+    assert alert.raw_data["status"] == "resolved"
+
+
+def test_mixed_batch(db):
+    """Test that one batch dispatches only its new and re-firing alerts."""
+    upsert_alerts(db, [row("fp-repeat"), row("fp-refire", status="resolved"), row("fp-resolve")])
+    alert_ids, created = upsert_alerts(db, [
+        row("fp-new"),
+        row("fp-repeat"),
+        row("fp-refire"),
+        row("fp-resolve", status="resolved"),
+    ])
+    assert alert_ids == [alert_id(db, "fp-refire"), alert_id(db, "fp-new")]
+    assert set(created) == {"fp-new", "fp-repeat", "fp-refire", "fp-resolve"}
+
+
+def test_upsert_keeps_first_api_call(db):
+    """Test that a re-sent alert stays attached to the request that created it."""
+    upsert_alerts(db, [row("fp-1")])
+    db.add(APICall(id=2, request_id="req-2", method="POST", path="/api/v1/webhook"))
+    upsert_alerts(db, [row("fp-1", api_call_id=2)])
+    assert db.scalar(select(Alert.api_call_id).where(Alert.fingerprint == "fp-1")) == 1
+
+
+def test_empty_batch(db):
+    """Test that an empty batch does nothing."""
+    assert upsert_alerts(db, []) == ([], {})
+
+
+def test_mysql_statement_compiles():
+    """Test that the MySQL upsert only references Alert columns."""
+    sql = str(_upsert_statement("mysql", [row("fp-1")]).compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE" in sql
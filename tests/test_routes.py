@@ -0,0 +1,217 @@
+"""Tests for the alert API routes."""
+import asyncio
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from app.api import routes
+from app.core import middleware
+from app.core.database import get_db
+from app.core.middleware import RequestIDMiddleware
+from app.models.models import APICall, Alert, TaskExecution
+
+
+def alert(fingerprint, status="firing"):
+    """Alert as Alertmanager sends it."""
+    return {
+        "status": status,
+        "labels": {"alertname": "HostDown", "severity": "critical", "instance": "node-1"},
+        "annotations": {"summary": "Host is down"},
+        "startsAt": "2026-01-01T00:00:00Z",
+        "generatorURL": "http://prometheus/graph",
+        "fingerprint": fingerprint,
+    }
+
+
+def payload(*alerts):
+    """Alertmanager webhook payload."""
+    return {
+        "version": "4",
+        "groupKey": "test",
+        "status": "firing",
+        "receiver": "poundcake",
+        "groupLabels": {},
+        "commonLabels": {},
+        "commonAnnotations": {},
+        "externalURL": "http://alertmanager",
+        "alerts": list(alerts),
+    }
+
+
+@pytest.fixture
+def Session(engine):
+    """Session factory for the in-memory database."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Capture the batches queued for processing instead of sending them to Celery."""
+    calls = []
+    monkeypatch.setattr(
+        routes.process_alert_batch, "apply_async", lambda args, task_id: calls.append((args, task_id))
+    )
+    monkeypatch.setattr(routes, "record_alerts_created", lambda created: None)
+    return calls
+
+
+@pytest.fixture
+def client(Session, monkeypatch):
+    """Test client for the alert routes, logging API calls to the in-memory database."""
+    monkeypatch.setattr(middleware, "SessionLocal", Session)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)
+    app.include_router(routes.router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def test_webhook_stores_and_queues_alerts(client, Session, queued):
+    """Test that a webhook stores its alerts and queues them in one batch task."""
+    response = client.post(
+        "/api/v1/webhook",
+        json=payload(alert("fp-1"), alert("fp-2")),
+        headers={"X-Request-ID": "req-1"},
+    )
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "accepted"
+    assert data["alerts_received"] == 2
+
+    with Session() as db:
+        api_call = db.scalars(select(APICall).where(APICall.request_id == "req-1")).one()
+        alerts = db.scalars(select(Alert).order_by(Alert.id)).all()
+        task = db.scalars(select(TaskExecution)).one()
+    assert [a.fingerprint for a in alerts] == ["fp-1", "fp-2"]
+    assert all(a.api_call_id == api_call.id for a in alerts)
+    assert alerts[0].labels["instance"] == "node-1"
+    assert task.task_id == data["task_ids"][0]
+    assert task.status == "pending"
+    assert queued == [([[a.id for a in alerts], "req-1"], task.task_id)]
+
+
+def test_api_call_logged_off_event_loop(client, Session, queued, monkeypatch):
+    """Test that the API call record is written from a worker thread and completed."""
+    insert_api_call = middleware._insert_api_call
+    on_event_loop = []
+
+    def spy(db, api_call):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        insert_api_call(db, api_call)
+
+    monkeypatch.setattr(middleware, "_insert_api_call", spy)
+    client.post("/api/v1/webhook", json=payload(alert("fp-1")), headers={"X-Request-ID": "req-1"})
+    assert on_event_loop == [False]
+
+    with Session() as db:
+        api_call = db.scalars(select(APICall).where(APICall.request_id == "req-1")).one()
+    assert api_call.status_code == 202
+    assert api_call.processing_time_ms is not None
+
+
+def test_webhook_repeat_not_queued(client, Session, queued):
+    """Test that a repeat notification of a firing alert isn't queued again."""
+    client.post("/api/v1/webhook", json=payload(alert("fp-1")))
+    response = client.post("/api/v1/webhook", json=payload(alert("fp-1")))
+    assert response.status_code == 202
+    assert response.json()["task_ids"] == []
+    assert len(queued) == 1
+
+    with Session() as db:
+        assert len(db.scalars(select(Alert)).all()) == 1
+        assert len(db.scalars(select(TaskExecution)).all()) == 1
+
+
+def test_webhook_queue_failure(client, Session, monkeypatch):
+    """Test that a failure to queue is recorded on the task execution."""
+    def apply_async(args, task_id):
+        raise ConnectionError("broker down")
+
+    monkeypatch.setattr(routes.process_alert_batch, "apply_async", apply_async)
+    monkeypatch.setattr(routes, "record_alerts_created", lambda created: None)
+
+    response = client.post("/api/v1/webhook", json=payload(alert("fp-1")))
+    assert response.status_code == 500
+
+    with Session() as db:
+        task = db.scalars(select(TaskExecution)).one()
+        assert db.scalar(select(Alert.fingerprint)) == "fp-1"
+    assert task.status == "failed"
+    assert task.error == "broker down"
+
+
+def test_webhook_no_alerts(client, queued):
+    """Test that an empty webhook is acknowledged without queuing anything."""
+    response = client.post("/api/v1/webhook", json=payload())
+    assert response.status_code == 202
+    assert response.json()["status"] == "no_alerts"
+    assert queued == []
+
+
+@pytest.fixture
+def stored_alerts(Session):
+    """Five alerts, two of them sharing a created_at."""
+    created = [
+        datetime(2026, 1, 1, 0, 0, 1),
+        datetime(2026, 1, 1, 0, 0, 2),
+        datetime(2026, 1, 1, 0, 0, 2),
+        datetime(2026, 1, 1, 0, 0, 3),
+        datetime(2026, 1, 1, 0, 0, 4),
+    ]
+    with Session() as db:
+        db.add(APICall(id=1, request_id="req-1", method="POST", path="/api/v1/webhook"))
+        for i, created_at in enumerate(created):
+            db.add(Alert(
+                api_call_id=1,
+                fingerprint=f"fp-{i}",
+                status="firing",
+                alert_name="HostDown",
+                labels={"alertname": "HostDown"},
+                created_at=created_at,
+            ))
+        db.commit()
+
+
+def test_list_alerts_keyset_pages(client, stored_alerts):
+    """Test that keyset pages walk every alert once, including created_at ties."""
+    seen = []
+    params = {"limit": 2}
+    while True:
+        page = client.get("/api/v1/alerts", params=params).json()
+        if not page:
+            break
+        seen.extend(a["fingerprint"] for a in page)
+        params = {"limit": 2, "before_created_at": page[-1]["created_at"], "before_id": page[-1]["id"]}
+    assert seen == ["fp-4", "fp-3", "fp-2", "fp-1", "fp-0"]
+
+
+@pytest.mark.parametrize("params", [
+    {"before_created_at": "2026-01-01T00:00:02"},
+    {"before_id": 3},
+])
+def test_list_alerts_partial_cursor(client, stored_alerts, params):
+    """Test that a cursor missing one of its halves is rejected."""
+    response = client.get("/api/v1/alerts", params=params)
+    assert response.status_code == 422
+
+
+def test_list_alerts_total_count(client, stored_alerts):
+    """Test that the filtered total is returned on request."""
+    response = client.get("/api/v1/alerts", params={"limit": 2, "include_total": True})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["X-Total-Count"] == "5"
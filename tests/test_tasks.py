@@ -0,0 +1,214 @@
+"""Tests for the StackStorm workflow mapping and alert batch task."""
+import threading
+import orjson
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from app.models.models import APICall, Alert, ST2ExecutionLink
+from app.tasks import tasks
+from app.tasks.tasks import determine_st2_workflow, process_alert_batch
+
+
+def alert(alertname=None, severity=None):
+    """Build the alert data determine_st2_workflow reads."""
+    labels = {}
+    if alertname is not None:
+        labels["alertname"] = alertname
+    if severity is not None:
+        labels["severity"] = severity
+    return {"labels": labels}
+
+
+@pytest.mark.parametrize("alertname, workflow", [
+    ("HostDown", "remediation.host_down_workflow"),
+    ("KubeNodeDownWarning", "remediation.host_down_workflow"),
+    ("HighMemoryUsage", "remediation.memory_check_workflow"),
+    ("DiskFullRoot", "remediation.disk_cleanup_workflow"),
+])
+def test_pattern_match(alertname, workflow):
+    """Test that an alert name containing a pattern maps to its workflow."""
+    assert determine_st2_workflow(alert(alertname, "critical")) == workflow
+
+
+@pytest.mark.parametrize("alertname, workflow", [
+    # HostDown is listed before DiskFull, even though DiskFull comes first in the name
+    ("DiskFullHostDown", "remediation.host_down_workflow"),
+    ("HighCPUNodeDown", "remediation.host_down_workflow"),
+    ("ServiceDownHighMemory", "remediation.memory_check_workflow"),
+])
+def test_first_map_entry_wins(alertname, workflow):
+    """Test that the earliest ST2_WORKFLOW_MAP entry wins when several patterns match."""
+    assert determine_st2_workflow(alert(alertname)) == workflow
+
+
+@pytest.mark.parametrize("severity, workflow", [
+    ("critical", "remediation.critical_alert_workflow"),
+    ("warning", "remediation.warning_alert_workflow"),
+    ("info", "remediation.default_workflow"),
+    (None, "remediation.default_workflow"),
+])
+def test_severity_fallback(severity, workflow):
+    """Test that unmatched alert names fall back to the severity workflow."""
+    assert determine_st2_workflow(alert("CertificateExpiring", severity)) == workflow
+
+
+def test_missing_labels():
+    """Test that alerts without labels get the default workflow."""
+    assert determine_st2_workflow({}) == "remediation.default_workflow"
+
+
+def test_cached_result_depends_on_severity():
+    """Test that the memoized lookup keys on severity as well as the alert name."""
+    assert determine_st2_workflow(alert("Unmatched", "critical")) == "remediation.critical_alert_workflow"
+    assert determine_st2_workflow(alert("Unmatched", "warning")) == "remediation.warning_alert_workflow"
+
+
+class FakeResponse:
+    """The parts of a requests.Response the batch task reads."""
+
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.content = orjson.dumps(data or {})
+        self.text = self.content.decode()
+
+
+@pytest.fixture
+def Session(engine, monkeypatch):
+    """Point the tasks at the in-memory database."""
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(tasks, "SessionLocal", Session)
+    return Session
+
+
+@pytest.fixture
+def alert_ids(Session):
+    """Store four alerts and return their ids."""
+    with Session() as db:
+        db.add(APICall(id=1, request_id="req-1", method="POST", path="/api/v1/webhook"))
+        alerts = [
+            Alert(
+                api_call_id=1,
+                fingerprint=f"fp-{i}",
+                status="firing",
+                alert_name="HostDown",
+                raw_data={"labels": {"alertname": "HostDown"}},
+            )
+            for i in range(4)
+        ]
+        db.add_all(alerts)
+        db.commit()
+        return [alert.id for alert in alerts]
+
+
+@pytest.fixture
+def st2(monkeypatch):
+    """Fake ST2 API: responses by fingerprint, execution ids derived from the fingerprint."""
+    responses = {}
+    calls = []
+
+    def trigger_st2_workflow(st2_workflow, st2_params):
+        fingerprint = st2_params["fingerprint"]
+        calls.append(fingerprint)
+        response = responses.get(fingerprint)
+        if isinstance(response, Exception):
+            raise response
+        if callable(response):
+            return response()
+        return response or FakeResponse(201, {"id": f"exec-{fingerprint}"})
+
+    monkeypatch.setattr(tasks, "trigger_st2_workflow", trigger_st2_workflow)
+    return responses, calls
+
+
+def links(Session):
+    """Stored (alert_id, st2_execution_id) pairs."""
+    with Session() as db:
+        return set(db.execute(
+            select(ST2ExecutionLink.alert_id, ST2ExecutionLink.st2_execution_id)
+        ).all())
+
+
+def test_batch_triggers_every_alert(Session, alert_ids, st2):
+    """Test that every alert is triggered and linked to its execution."""
+    result = process_alert_batch(alert_ids, "req-1")
+    assert result == {"success": True, "triggered": 4, "failed": 0}
+    assert links(Session) == {(alert_id, f"exec-fp-{i}") for i, alert_id in enumerate(alert_ids)}
+
+    with Session() as db:
+        rules = db.scalars(select(Alert.st2_rule_matched)).all()
+    assert rules == ["remediation.host_down_workflow"] * 4
+
+
+def test_batch_counts_failed_triggers(Session, alert_ids, st2):
+    """Test that ST2 errors and exceptions are counted and leave no link."""
+    responses, _ = st2
+    responses["fp-1"] = FakeResponse(500)
+    responses["fp-2"] = ConnectionError("ST2 unreachable")
+
+    result = process_alert_batch(alert_ids, "req-1")
+    assert result == {"success": False, "triggered": 2, "failed": 2}
+    assert links(Session) == {(alert_ids[0], "exec-fp-0"), (alert_ids[3], "exec-fp-3")}
+
+
+def test_batch_splits_oversized_batches(Session, alert_ids, st2, monkeypatch):
+    """Test that alerts beyond ALERT_BATCH_SIZE are queued as further tasks."""
+    queued = []
+    monkeypatch.setattr(tasks, "ALERT_BATCH_SIZE", 1)
+    monkeypatch.setattr(process_alert_batch, "apply_async", lambda args: queued.append(args))
+
+    result = process_alert_batch(alert_ids, "req-1")
+    assert result["triggered"] == 1
+    assert st2[1] == ["fp-0"]
+    assert queued == [[[alert_id], "req-1"] for alert_id in alert_ids[1:]]
+
+
+def test_batch_counts_unsaved_links_as_failed(Session, alert_ids, st2):
+    """Test that executions whose links can't be committed are counted as failed."""
+    responses, _ = st2
+    # No execution id: the link violates NOT NULL st2_execution_id
+    responses["fp-0"] = FakeResponse(201, {})
+
+    result = process_alert_batch(alert_ids[:1], "req-1")
+    assert result == {"success": False, "triggered": 0, "failed": 1}
+    assert links(Session) == set()
+
+
+def test_batch_soft_time_limit_waits_for_in_flight_calls(Session, alert_ids, st2, monkeypatch):
+    """Test that the soft time limit cancels queued calls but stores links for in-flight ones."""
+    responses, calls = st2
+    release = threading.Event()
+    in_flight = threading.Event()
+
+    def slow_response():
+        in_flight.set()
+        release.wait(5)
+        return FakeResponse(201, {"id": "exec-fp-0"})
+
+    responses["fp-0"] = slow_response
+    wait = tasks.wait
+
+    limit_hit = []
+
+    def wait_until_soft_limit(futures, **kwargs):
+        if not limit_hit:
+            # Hit the limit while fp-0 is in flight and fp-1 still queued
+            in_flight.wait(5)
+            limit_hit.append(True)
+            raise SoftTimeLimitExceeded()
+        # fp-1 has been cancelled by now; let fp-0 return
+        release.set()
+        return wait(futures, **kwargs)
+
+    monkeypatch.setattr(tasks, "ST2_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(tasks, "wait", wait_until_soft_limit)
+
+    result = process_alert_batch(alert_ids[:2], "req-1")
+    assert result == {
+        "success": False,
+        "triggered": 1,
+        "failed": 1,
+        "error": "soft time limit exceeded",
+    }
+    assert calls == ["fp-0"]
+    assert links(Session) == {(alert_ids[0], "exec-fp-0")}
@@ -0,0 +1,74 @@
+"""Tests for the custom column types."""
+import orjson
+import pytest
+import zstandard
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select, text
+from sqlalchemy.dialects import mysql, sqlite
+from app.models.types import COMPRESSION_THRESHOLD, ZSTD_MAGIC, CompressedJSON
+
+SMALL = {"alertname": "HostDown", "severity": "critical"}
+LARGE = {"description": "x" * (COMPRESSION_THRESHOLD * 2), "items": list(range(500))}
+
+column_type = CompressedJSON()
+dialect = sqlite.dialect()
+
+
+def test_below_threshold_stored_as_plain_json():
+    """Test that small payloads are stored as uncompressed JSON bytes."""
+    stored = column_type.process_bind_param(SMALL, dialect)
+    assert stored == orjson.dumps(SMALL)
+    assert not stored.startswith(ZSTD_MAGIC)
+
+
+def test_above_threshold_compressed():
+    """Test that large payloads are stored as a smaller zstd frame."""
+    stored = column_type.process_bind_param(LARGE, dialect)
+    assert stored.startswith(ZSTD_MAGIC)
+    assert len(stored) < len(orjson.dumps(LARGE))
+
+
+@pytest.mark.parametrize("value", [SMALL, LARGE, [], "text", 0])
+def test_round_trip(value):
+    """Test that values read back unchanged whether or not they were compressed."""
+    stored = column_type.process_bind_param(value, dialect)
+    assert column_type.process_result_value(stored, dialect) == value
+
+
+def test_none_passthrough():
+    """Test that NULL is stored and read back as NULL."""
+    assert column_type.process_bind_param(None, dialect) is None
+    assert column_type.process_result_value(None, dialect) is None
+
+
+def test_magic_detection():
+    """Test that values are decoded by their leading bytes, not by their size."""
+    small_frame = zstandard.ZstdCompressor().compress(orjson.dumps(SMALL))
+    assert column_type.process_result_value(small_frame, dialect) == SMALL
+
+    large_plain = orjson.dumps(LARGE)
+    assert column_type.process_result_value(large_plain, dialect) == LARGE
+
+
+def test_database_round_trip():
+    """Test that values survive a write and read through a real connection."""
+    metadata = MetaData()
+    table = Table(
+        "payloads",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("data", CompressedJSON),
+    )
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(table), [{"id": 1, "data": SMALL}, {"id": 2, "data": LARGE}])
+        rows = dict(conn.execute(select(table.c.id, table.c.data)).all())
+        raw = conn.execute(text("SELECT data FROM payloads WHERE id = 2")).scalar()
+    assert rows == {1: SMALL, 2: LARGE}
+    assert raw.startswith(ZSTD_MAGIC)
+    engine.dispose()
+
+
+def test_mysql_column_is_longblob():
+    """Test that MySQL stores the type as LONGBLOB."""
+    assert column_type.load_dialect_impl(mysql.dialect()).__class__ is mysql.LONGBLOB
@@ -0,0 +1,140 @@
+"""Tests for the v1 webhook endpoint."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from app.api.v1 import webhook
+from app.core import middleware
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.middleware import RequestIDMiddleware
+from app.models.models import APICall, Alert
+
+
+def alert(fingerprint, status="firing"):
+    """Alert as Alertmanager sends it."""
+    return {
+        "status": status,
+        "labels": {"alertname": "HostDown", "severity": "critical", "instance": "node-1"},
+        "annotations": {"summary": "Host is down"},
+        "startsAt": "2026-01-01T00:00:00Z",
+        "fingerprint": fingerprint,
+    }
+
+
+def payload(*alerts):
+    """Alertmanager webhook payload."""
+    return {
+        "version": "4",
+        "groupKey": "test",
+        "status": "firing",
+        "receiver": "poundcake",
+        "groupLabels": {},
+        "commonLabels": {},
+        "commonAnnotations": {},
+        "externalURL": "http://alertmanager",
+        "alerts": list(alerts),
+    }
+
+
+@pytest.fixture
+def Session(engine):
+    """Session factory for the in-memory database."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Capture the batches queued for processing instead of sending them to Celery."""
+    calls = []
+    monkeypatch.setattr(webhook.process_alert_batch, "delay", lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(webhook, "record_alerts_created", lambda created: None)
+    return calls
+
+
+@pytest.fixture
+def client(Session, monkeypatch):
+    """Test client for the v1 router behind the request-logging middleware."""
+    monkeypatch.setattr(middleware, "SessionLocal", Session)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)
+    app.include_router(webhook.router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def test_webhook_stores_and_queues_alerts(client, Session, queued):
+    """Test that the webhook stores its request and alerts and queues new alerts."""
+    response = client.post("/api/v1/webhook", json=payload(alert("fp-1"), alert("fp-2")))
+    assert response.status_code == 202
+    data = response.json()
+    assert data["alerts_received"] == 2
+
+    with Session() as db:
+        api_call = db.scalars(select(APICall).where(APICall.request_id == data["request_id"])).one()
+        alerts = db.scalars(select(Alert).order_by(Alert.id)).all()
+    assert api_call.body["alerts"][0]["fingerprint"] == "fp-1"
+    assert [a.api_call_id for a in alerts] == [api_call.id, api_call.id]
+    assert alerts[0].raw_data["labels"]["instance"] == "node-1"
+    assert queued == [{"alert_ids": [a.id for a in alerts], "request_id": data["request_id"]}]
+
+
+def test_webhook_caps_stored_body(client, Session, queued, monkeypatch):
+    """Test that an oversized body is stored as a size marker in every API call record."""
+    monkeypatch.setattr(settings, "api_call_max_body_bytes", 100)
+    response = client.post("/api/v1/webhook", json=payload(alert("fp-1")))
+    assert response.status_code == 202
+
+    size = int(response.request.headers["content-length"])
+    with Session() as db:
+        bodies = db.scalars(select(APICall.body)).all()
+    assert bodies == [{"truncated": True, "size": size}] * 2
+
+
+def test_webhook_rejects_invalid_payload(client, queued):
+    """Test that a payload missing required fields is rejected with its location."""
+    response = client.post("/api/v1/webhook", json={"alerts": [{"status": "firing"}]})
+    assert response.status_code == 422
+    locs = [tuple(error["loc"]) for error in response.json()["detail"]]
+    assert ("body", "version") in locs
+    assert queued == []
+
+
+def test_webhook_without_middleware(Session, queued, monkeypatch):
+    """Test that the webhook stores the validated payload when the middleware didn't parse it."""
+    monkeypatch.setattr(settings, "api_call_max_body_bytes", 100)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(webhook.router, prefix="/api/v1")
+    app.dependency_overrides[get_db] = override_get_db
+    response = TestClient(app).post("/api/v1/webhook", json=payload(alert("fp-1")))
+    assert response.status_code == 202
+
+    with Session() as db:
+        body = db.scalars(select(APICall.body)).one()
+        raw_data = db.scalars(select(Alert.raw_data)).one()
+    assert body["truncated"] is True
+    assert raw_data["fingerprint"] == "fp-1"
+
+
+def test_webhook_documents_request_body(client):
+    """Test that the OpenAPI schema documents the Alertmanager payload."""
+    operation = client.get("/openapi.json").json()["paths"]["/api/v1/webhook"]["post"]
+    schema = operation["requestBody"]["content"]["application/json"]["schema"]
+    assert schema["$ref"].endswith("/AlertmanagerWebhook")